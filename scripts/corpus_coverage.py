@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Corpus Coverage
+
+Finds out which idea spaces the generated suggestions already cover. Every
+suggestion is turned into a TF-IDF vector, the vectors of each category are
+clustered with k-means, and a coverage map is written per category to
+example-suggestions/.coverage/<category folder>.json. Near-identical
+clusters are grouped into themes. The map lists the clusters and themes with
+their share of the corpus, top terms, example titles and mean rating, plus
+the themes to avoid (over-represented) and to explore (small but well rated),
+and profile terms the corpus rarely uses.
+
+The agent's --steer option turns a category's map into "explore X, avoid Y"
+hints in the generation prompt.
+
+Term counts are cached per file (keyed by modification time and size), so a
+refresh only reads new and changed suggestions. TF-IDF rows are built in
+batches and k-means streams over those batches, so the dense vectors only
+ever exist for one batch at a time. The term cache itself (the sparse term
+counts, title and rating of every suggestion) is loaded whole, so memory
+still grows with the corpus, just far more slowly than a full TF-IDF matrix.
+
+Requires numpy.
+
+Usage:
+    python scripts/corpus_coverage.py
+    python scripts/corpus_coverage.py --category side_hustles --clusters 12
+    python scripts/corpus_coverage.py --hints side_hustles
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import argparse
+import collections
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from suggestion_metadata import parse_suggestion
+from suggestion_catalog import category_from_path, iter_suggestion_files
+from suggestion_archive import iter_archive_entries
+
+# Constants
+SUGGESTIONS_DIR = "example-suggestions"
+USER_PROFILE_PATH = "user-data/user-profile.json"
+COVERAGE_DIR = os.path.join(SUGGESTIONS_DIR, ".coverage")
+TERM_CACHE_PATH = os.path.join(COVERAGE_DIR, "term-cache.json")
+
+# Vectorizer settings
+MAX_FEATURES = 4096
+# Only terms in nearly every document (template boilerplate) say nothing about the idea; a
+# theme covering most of the corpus must keep its own terms, or it can't be flagged as over-sampled
+MAX_DOCUMENT_FREQUENCY = 0.9
+TITLE_WEIGHT = 3
+BATCH_SIZE = 1024
+
+# Clustering settings
+MAX_CLUSTERS = 24
+MAX_ITERATIONS = 25
+INIT_SAMPLE_SIZE = 4096
+TOP_TERMS = 6
+EXAMPLE_TITLES = 3
+THEME_SIMILARITY = 0.8  # clusters whose centroids are this similar form one theme
+
+# Hint settings
+OVER_REPRESENTED_SHARE = 1.5  # x the average cluster share
+UNDER_REPRESENTED_SHARE = 0.6
+PROFILE_GAP_FREQUENCY = 0.02  # profile terms in fewer than 2% of suggestions
+MAX_HINTS = 3
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "been", "being", "but", "by", "can", "could", "do", "does",
+    "for", "from", "has", "have", "how", "if", "in", "into", "is", "it", "its", "may", "more", "most",
+    "not", "of", "on", "or", "other", "our", "out", "over", "so", "such", "than", "that", "the", "their",
+    "them", "then", "there", "these", "they", "this", "those", "through", "to", "up", "use", "used",
+    "using", "very", "was", "were", "what", "when", "where", "which", "while", "who", "will", "with",
+    "would", "you", "your", "also", "all", "any", "each", "both", "well", "like", "including", "based",
+    "etc", "per", "one", "two", "new"
+}
+
+def tokenize(text):
+    """Return the significant lower-case words in text."""
+    return [word for word in re.findall(r'[a-z][a-z0-9]+', text.lower())
+            if word not in STOPWORDS and len(word) > 2]
+
+def document_terms(content):
+    """Count a suggestion's terms, weighting the title and skipping heading lines."""
+    parsed = parse_suggestion(content)
+    body = "\n".join(line for line in content.splitlines() if not line.lstrip().startswith("#"))
+    counts = collections.Counter(tokenize(body))
+    for word in tokenize(parsed["title"]):
+        counts[word] += TITLE_WEIGHT
+    return parsed["title"], parsed["rating"], dict(counts)
+
+def load_term_cache(cache_path=TERM_CACHE_PATH):
+    """Load the cached term counts, or an empty cache."""
+    try:
+        with open(cache_path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def update_term_cache(suggestions_dir=SUGGESTIONS_DIR, cache_path=TERM_CACHE_PATH):
+    """Bring the cached term counts in line with the files on disk and the run archives.
+
+    Only new and changed files are read. Returns (cache, updated, removed).
+    """
+    cache = load_term_cache(cache_path)
+    seen = set()
+    updated = 0
+
+    def store(relative_path, signature, content):
+        title, rating, terms = document_terms(content)
+        cache[relative_path] = {
+            "signature": signature,
+            "category": category_from_path(relative_path),
+            "title": title,
+            "rating": rating,
+            "terms": terms
+        }
+
+    for relative_path, file_path in iter_suggestion_files(suggestions_dir):
+        seen.add(relative_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            continue
+        signature = [stat.st_mtime_ns, stat.st_size]
+        entry = cache.get(relative_path)
+        if entry and entry["signature"] == signature:
+            continue
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                store(relative_path, signature, f.read())
+        except OSError as e:
+            print(f"❌ Error reading {file_path}: {e}")
+            continue
+        updated += 1
+
+    # Archived suggestions keep the signature they had as loose files
+    for archive, archived in iter_archive_entries(suggestions_dir):
+        relative_path = archived["path"]
+        if relative_path in seen:
+            continue
+        seen.add(relative_path)
+        signature = [archived["mtime_ns"], archived["length"]]
+        entry = cache.get(relative_path)
+        if entry and entry["signature"] == signature:
+            continue
+        store(relative_path, signature, archive.read(archived))
+        updated += 1
+
+    removed = [path for path in cache if path not in seen]
+    for path in removed:
+        del cache[path]
+
+    if updated or removed:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'w') as f:
+            json.dump(cache, f, separators=(",", ":"))
+    return cache, updated, len(removed)
+
+def build_vocabulary(documents):
+    """Choose the vocabulary and inverse document frequencies for a set of documents.
+
+    Returns (terms, {term: column}, idf array).
+    """
+    document_frequency = collections.Counter()
+    for document in documents:
+        document_frequency.update(document["terms"].keys())
+
+    total = len(documents)
+    min_frequency = 2 if total >= 20 else 1
+    max_frequency = max(min_frequency, int(total * MAX_DOCUMENT_FREQUENCY))
+    candidates = [term for term, frequency in document_frequency.items()
+                  if min_frequency <= frequency <= max_frequency]
+    terms = sorted(candidates, key=lambda term: (-document_frequency[term], term))[:MAX_FEATURES]
+    columns = {term: i for i, term in enumerate(terms)}
+    idf = np.array([math.log((1 + total) / (1 + document_frequency[term])) + 1 for term in terms],
+                   dtype=np.float32)
+    return terms, columns, idf
+
+def tfidf_rows(documents, columns, idf):
+    """Return L2-normalized TF-IDF rows (float32) for a batch of documents."""
+    rows = np.zeros((len(documents), len(columns)), dtype=np.float32)
+    for i, document in enumerate(documents):
+        for term, count in document["terms"].items():
+            column = columns.get(term)
+            if column is not None:
+                rows[i, column] = 1 + math.log(count)
+    rows *= idf
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return rows / norms
+
+def tfidf_batches(documents, columns, idf, batch_size=BATCH_SIZE):
+    """Yield (start index, rows) batches of TF-IDF vectors."""
+    for start in range(0, len(documents), batch_size):
+        yield start, tfidf_rows(documents[start:start + batch_size], columns, idf)
+
+def initial_centroids(documents, columns, idf, k, rng):
+    """Pick k starting centroids with k-means++ on a sample of the documents."""
+    sample_size = min(len(documents), INIT_SAMPLE_SIZE)
+    sample_indexes = np.sort(rng.choice(len(documents), size=sample_size, replace=False))
+    sample = tfidf_rows([documents[i] for i in sample_indexes], columns, idf)
+
+    centroids = [sample[rng.integers(sample_size)]]
+    distances = 1 - sample @ centroids[0]
+    for _ in range(1, k):
+        weights = np.clip(distances, 0, None)
+        total = weights.sum()
+        choice = rng.choice(sample_size, p=weights / total) if total > 0 else rng.integers(sample_size)
+        centroids.append(sample[choice])
+        distances = np.minimum(distances, 1 - sample @ sample[choice])
+    return np.array(centroids, dtype=np.float32)
+
+def cluster_documents(documents, columns, idf, k, seed=0):
+    """Cluster documents with spherical k-means, streaming over TF-IDF batches.
+
+    Returns (labels, similarity of each document to its centroid, centroids).
+    """
+    rng = np.random.default_rng(seed)
+    centroids = initial_centroids(documents, columns, idf, k, rng)
+    labels = np.full(len(documents), -1, dtype=np.int32)
+    similarities = np.zeros(len(documents), dtype=np.float32)
+
+    for _ in range(MAX_ITERATIONS):
+        sums = np.zeros_like(centroids)
+        changed = 0
+        for start, rows in tfidf_batches(documents, columns, idf):
+            scores = rows @ centroids.T
+            batch_labels = scores.argmax(axis=1)
+            end = start + len(rows)
+            changed += int((labels[start:end] != batch_labels).sum())
+            labels[start:end] = batch_labels
+            similarities[start:end] = scores[np.arange(len(rows)), batch_labels]
+            np.add.at(sums, batch_labels, rows)
+
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Empty clusters keep their previous centroid
+        centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1), centroids)
+        if changed <= len(documents) // 1000:
+            break
+    return labels, similarities, centroids
+
+def default_cluster_count(document_count):
+    """Pick a cluster count that grows slowly with the corpus."""
+    return max(1, min(MAX_CLUSTERS, document_count, round(math.sqrt(document_count / 2))))
+
+def profile_terms(profile_path=USER_PROFILE_PATH):
+    """Return a Counter of the significant terms in the user profile."""
+    try:
+        with open(profile_path, 'r') as f:
+            profile = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return collections.Counter()
+
+    values = []
+    def collect(value):
+        if isinstance(value, dict):
+            for item in value.values():
+                collect(item)
+        elif isinstance(value, list):
+            for item in value:
+                collect(item)
+        elif isinstance(value, str):
+            values.append(value)
+    collect(profile)
+    # Links and e-mail addresses are not skills
+    text = re.sub(r'\S+@\S+|https?://\S+|www\.\S+', ' ', " ".join(values))
+    return collections.Counter(tokenize(text))
+
+def group_themes(centroids, cluster_ids):
+    """Group clusters whose centroids are near-duplicates into themes.
+
+    k-means splits a heavily sampled idea into several similar clusters; a
+    theme puts them back together so its true share of the corpus shows.
+    Returns a list of cluster id lists.
+    """
+    parent = {cluster: cluster for cluster in cluster_ids}
+
+    def find(cluster):
+        while parent[cluster] != cluster:
+            parent[cluster] = parent[parent[cluster]]
+            cluster = parent[cluster]
+        return cluster
+
+    similarities = centroids @ centroids.T
+    for i, a in enumerate(cluster_ids):
+        for b in cluster_ids[i + 1:]:
+            if similarities[a, b] >= THEME_SIMILARITY:
+                parent[find(a)] = find(b)
+
+    themes = collections.defaultdict(list)
+    for cluster in cluster_ids:
+        themes[find(cluster)].append(cluster)
+    return list(themes.values())
+
+def build_coverage_map(category_folder, documents, k=None, profile_path=USER_PROFILE_PATH):
+    """Cluster one category's documents and describe how they cover the idea space."""
+    terms, columns, idf = build_vocabulary(documents)
+    coverage = {"category": category_folder, "documents": len(documents), "clusters": [], "themes": [],
+                "avoid": [], "explore": [], "profile_gaps": []}
+    if not terms:
+        return coverage
+
+    k = min(k or default_cluster_count(len(documents)), len(documents))
+    labels, similarities, centroids = cluster_documents(documents, columns, idf, k)
+
+    def describe(members, centroid):
+        closest = members[np.argsort(-similarities[members])[:EXAMPLE_TITLES]]
+        member_ratings = [documents[i]["rating"] for i in members if documents[i]["rating"] is not None]
+        return {
+            "size": int(len(members)),
+            "share": round(len(members) / len(documents), 4),
+            "top_terms": [terms[i] for i in np.argsort(-centroid)[:TOP_TERMS]],
+            "examples": [documents[i]["title"] for i in closest],
+            "mean_rating": round(sum(member_ratings) / len(member_ratings), 2) if member_ratings else None
+        }
+
+    members_by_cluster = {cluster: np.flatnonzero(labels == cluster) for cluster in range(k)}
+    cluster_ids = [cluster for cluster, members in members_by_cluster.items() if len(members)]
+    for theme_id, theme_clusters in enumerate(group_themes(centroids, cluster_ids)):
+        members = np.concatenate([members_by_cluster[cluster] for cluster in theme_clusters])
+        sizes = np.array([len(members_by_cluster[cluster]) for cluster in theme_clusters], dtype=np.float32)
+        centroid = (centroids[theme_clusters] * sizes[:, None]).sum(axis=0)
+        coverage["themes"].append(dict(describe(members, centroid), id=theme_id, clusters=theme_clusters))
+        for cluster in theme_clusters:
+            coverage["clusters"].append(dict(describe(members_by_cluster[cluster], centroids[cluster]),
+                                             id=cluster, theme=theme_id,
+                                             cohesion=round(float(similarities[members_by_cluster[cluster]].mean()), 3)))
+    coverage["clusters"].sort(key=lambda cluster: cluster["size"], reverse=True)
+    coverage["themes"].sort(key=lambda theme: theme["size"], reverse=True)
+
+    ratings = [document["rating"] for document in documents if document["rating"] is not None]
+    corpus_rating = sum(ratings) / len(ratings) if ratings else None
+    average_share = 1 / len(coverage["themes"])
+    coverage["avoid"] = [theme["id"] for theme in coverage["themes"]
+                         if theme["share"] >= OVER_REPRESENTED_SHARE * average_share][:MAX_HINTS]
+    promising = [theme for theme in coverage["themes"]
+                 if theme["share"] <= UNDER_REPRESENTED_SHARE * average_share
+                 and (corpus_rating is None or (theme["mean_rating"] or 0) >= corpus_rating)]
+    coverage["explore"] = [theme["id"] for theme in
+                           sorted(promising, key=lambda theme: theme["mean_rating"] or 0, reverse=True)][:MAX_HINTS]
+
+    # Recurring profile terms (skills, interests) that hardly any suggestion builds on yet
+    frequency = collections.Counter()
+    for document in documents:
+        frequency.update(document["terms"].keys())
+    coverage["profile_gaps"] = [
+        term for term, count in profile_terms(profile_path).most_common()
+        if count >= 2 and frequency[term] <= PROFILE_GAP_FREQUENCY * len(documents)
+    ][:MAX_HINTS * 2]
+    return coverage
+
+def coverage_map_path(category_folder):
+    """Return where a category's coverage map is written."""
+    return os.path.join(COVERAGE_DIR, f"{category_folder}.json")
+
+def refresh_coverage(suggestions_dir=SUGGESTIONS_DIR, categories=None, k=None, profile_path=USER_PROFILE_PATH):
+    """Update the term cache and rewrite the coverage map of each category.
+
+    Returns {category folder: coverage map}.
+    """
+    if np is None:
+        print("❌ Corpus coverage needs numpy: pip install numpy")
+        return {}
+
+    cache, updated, removed = update_term_cache(suggestions_dir)
+    print(f"✅ Term cache: {len(cache)} suggestions ({updated} read, {removed} removed)")
+
+    by_category = collections.defaultdict(list)
+    for relative_path in sorted(cache):
+        entry = cache[relative_path]
+        if entry["category"] and (not categories or entry["category"] in categories):
+            by_category[entry["category"]].append(entry)
+
+    maps = {}
+    os.makedirs(COVERAGE_DIR, exist_ok=True)
+    for category_folder, documents in sorted(by_category.items()):
+        coverage = build_coverage_map(category_folder, documents, k, profile_path)
+        with open(coverage_map_path(category_folder), 'w') as f:
+            json.dump(coverage, f, indent=2)
+        maps[category_folder] = coverage
+    return maps
+
+def load_coverage_map(category_folder):
+    """Load a category's coverage map, or None if it has not been built."""
+    try:
+        with open(coverage_map_path(category_folder), 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def steering_hints(coverage):
+    """Turn a coverage map into prompt text, or None if it has nothing to say."""
+    themes = {theme["id"]: theme for theme in coverage["themes"]}
+
+    def describe(theme_id):
+        theme = themes[theme_id]
+        example = f' (e.g. "{theme["examples"][0]}")' if theme["examples"] else ""
+        return ", ".join(theme["top_terms"][:3]) + example
+
+    lines = []
+    if coverage["avoid"]:
+        lines.append("- AVOID these over-represented themes: " + "; ".join(describe(t) for t in coverage["avoid"]))
+    if coverage["explore"]:
+        lines.append("- EXPLORE these promising but rarely covered themes: "
+                     + "; ".join(describe(t) for t in coverage["explore"]))
+    if coverage["profile_gaps"]:
+        lines.append("- Parts of the profile that few suggestions build on yet: " + ", ".join(coverage["profile_gaps"]))
+    if not lines:
+        return None
+    return (f"COVERAGE GUIDANCE (based on the {coverage['documents']} suggestions generated so far):\n"
+            + "\n".join(lines) + "\n")
+
+def print_coverage(coverage):
+    """Print a category's themes."""
+    print(f"\n📂 {coverage['category']}: {coverage['documents']} suggestions, "
+          f"{len(coverage['clusters'])} clusters in {len(coverage['themes'])} themes")
+    for theme in coverage["themes"]:
+        tag = " (avoid)" if theme["id"] in coverage["avoid"] else " (explore)" if theme["id"] in coverage["explore"] else ""
+        rating = f"{theme['mean_rating']:.1f}" if theme["mean_rating"] is not None else "-"
+        print(f"  {theme['share'] * 100:5.1f}%  {theme['size']:>5}  rating {rating:>4}  "
+              f"{', '.join(theme['top_terms'])}{tag}")
+    if coverage["profile_gaps"]:
+        print(f"  Profile gaps: {', '.join(coverage['profile_gaps'])}")
+
+def main():
+    """Main function to build the coverage maps."""
+    parser = argparse.ArgumentParser(description="Suggestion Corpus Coverage")
+    parser.add_argument("--category", action="append",
+                        help="Category folder to map (repeatable; default: all)")
+    parser.add_argument("--clusters", type=int, help="Clusters per category (default: grows with the corpus)")
+    parser.add_argument("--profile", default=USER_PROFILE_PATH, help="User profile used to find profile gaps")
+    parser.add_argument("--hints", metavar="CATEGORY", help="Print the prompt hints for a category folder and exit")
+    args = parser.parse_args()
+
+    if args.hints:
+        coverage = load_coverage_map(args.hints)
+        if coverage is None:
+            print(f"❌ No coverage map for {args.hints}; run this script without --hints first")
+            sys.exit(1)
+        print(steering_hints(coverage) or "No hints: the category is evenly covered.")
+        return
+
+    maps = refresh_coverage(categories=args.category, k=args.clusters, profile_path=args.profile)
+    if not maps and np is None:
+        sys.exit(1)
+    for coverage in maps.values():
+        print_coverage(coverage)
+    print(f"\n📁 Coverage maps saved to {COVERAGE_DIR}/")
+
+if __name__ == "__main__":
+    main()
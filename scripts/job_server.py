@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+Ideation Job Server
+
+Runs the ideation agent as a long-lived local service. Generation jobs
+(profile, category, count, temperature, priority) are submitted over a small
+HTTP API and stored in a persistent SQLite queue, so queued and half-finished
+jobs survive a restart. A shared pool of worker threads works through the
+queue one suggestion at a time against a single Ollama model that is kept
+loaded, which keeps the backend busy instead of many interactive runs each
+waiting on a cold model.
+
+Scheduling: higher priority jobs go first; among jobs of equal priority the
+profile that has been served the fewest suggestions goes next, so one large
+job cannot starve everyone else.
+
+API:
+    POST   /jobs              submit a job
+    GET    /jobs              list jobs
+    GET    /jobs/<id>         job status
+    GET    /jobs/<id>/result  saved files (add ?content=1 for the markdown)
+    DELETE /jobs/<id>         cancel a job
+
+A job's profile is either inline JSON or the name of a profile file in the
+user-data folder.
+
+Example:
+    curl -X POST localhost:8765/jobs -d '{"profile": "user-profile.json",
+         "category": "side_hustle", "count": 20, "temperature": 0.7}'
+"""
+
+import os
+import sys
+import json
+import math
+import uuid
+import sqlite3
+import argparse
+import datetime
+import threading
+import collections
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+import side_hustle_ideation_agent as agent
+from suggestion_metadata import append_run_record
+from suggestion_archive import SuggestionArchive, ArchiveError, archive_path
+
+# Constants
+JOBS_DB_PATH = os.path.join(agent.SUGGESTIONS_DIR, ".jobs", "jobs.db")
+JOBS_OUTPUT_DIR = os.path.join(agent.SUGGESTIONS_DIR, "jobs")
+PROFILES_DIR = os.path.dirname(agent.USER_PROFILE_PATH)
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 2
+DEFAULT_KEEP_ALIVE = "30m"
+MAX_JOB_SIZE = 1000
+MAX_TEMPERATURE = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    profile_key TEXT NOT NULL,
+    profile_json TEXT NOT NULL,
+    category TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    temperature REAL NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, priority);
+CREATE TABLE IF NOT EXISTS results (
+    job_id TEXT NOT NULL REFERENCES jobs (id),
+    position INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (job_id, position)
+);
+"""
+
+ACTIVE_STATUSES = ("queued", "running")
+
+def now():
+    """Return the current time as an ISO 8601 string."""
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+class JobQueue:
+    """Persistent job queue with priority and fair-share scheduling.
+
+    Every database call goes through one connection guarded by a lock; the
+    work per call is tiny compared to a generation request.
+    """
+
+    def __init__(self, db_path=JOBS_DB_PATH):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._work_available = threading.Condition(self._lock)
+        # Units handed to workers but not finished yet, per job
+        self._in_flight = collections.Counter()
+        # Suggestions served per profile since startup, for fair share
+        self._served = collections.Counter()
+
+        # Jobs that were running when the server stopped resume from where they were
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running'")
+
+    def submit(self, profile_key, profile, category, count, temperature, priority=0):
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    """INSERT INTO jobs (id, profile_key, profile_json, category, count, temperature, priority,
+                                         status, created_at, updated_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, 'queued', ?, ?)""",
+                    (job_id, profile_key, json.dumps(profile), category, count, temperature, priority, now(), now())
+                )
+            self._work_available.notify_all()
+        return job_id
+
+    def claim(self, timeout=1.0):
+        """Hand out the next suggestion to generate.
+
+        Returns (job row, index of the suggestion within the job), or None
+        if there is no work within timeout seconds.
+        """
+        with self._lock:
+            job = self._next_job()
+            if job is None:
+                self._work_available.wait(timeout)
+                job = self._next_job()
+            if job is None:
+                return None
+            index = job["completed"] + job["failed"] + self._in_flight[job["id"]]
+            self._in_flight[job["id"]] += 1
+            self._served[job["profile_key"]] += 1
+            if job["status"] == "queued":
+                with self._conn:
+                    self._conn.execute("UPDATE jobs SET status = 'running', updated_at = ? WHERE id = ?",
+                                       (now(), job["id"]))
+            return job, index
+
+    def _next_job(self):
+        rows = self._conn.execute(
+            "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY priority DESC, created_at",
+            ACTIVE_STATUSES
+        ).fetchall()
+        candidates = [
+            row for row in rows
+            if row["completed"] + row["failed"] + self._in_flight[row["id"]] < row["count"]
+        ]
+        if not candidates:
+            return None
+        top_priority = candidates[0]["priority"]
+        candidates = [row for row in candidates if row["priority"] == top_priority]
+        # Rows are oldest first, and min() keeps the first of equals
+        return min(candidates, key=lambda row: self._served[row["profile_key"]])
+
+    def finish_unit(self, job_id, path=None, error=None):
+        """Record the outcome of one generated suggestion.
+        
+        Returns the job row if this was the job's last unit (the job is done,
+        failed, or cancelled with nothing left in flight), otherwise None.
+        """
+        with self._lock:
+            self._in_flight[job_id] -= 1
+            with self._conn:
+                if path:
+                    position = self._conn.execute("SELECT completed FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+                    self._conn.execute("INSERT INTO results (job_id, position, path) VALUES (?, ?, ?)",
+                                       (job_id, position, path))
+                    self._conn.execute("UPDATE jobs SET completed = completed + 1, updated_at = ? WHERE id = ?",
+                                       (now(), job_id))
+                else:
+                    self._conn.execute("UPDATE jobs SET failed = failed + 1, error = ?, updated_at = ? WHERE id = ?",
+                                       (error, now(), job_id))
+                job = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                if job["status"] in ACTIVE_STATUSES and job["completed"] + job["failed"] >= job["count"]:
+                    status = "done" if job["completed"] else "failed"
+                    self._conn.execute("UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?",
+                                       (status, now(), job_id))
+                elif not (job["status"] == "cancelled" and self._in_flight[job_id] == 0):
+                    return None
+            return self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job.
+        
+        Returns (job row, ended), where ended is True if no suggestion of the
+        job is still being generated (otherwise the last one to finish ends
+        it, see finish_unit()), or None if the job is unknown or finished.
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', updated_at = ? WHERE id = ? AND status IN (?, ?)",
+                (now(), job_id) + ACTIVE_STATUSES
+            )
+            if cursor.rowcount == 0:
+                return None
+            job = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return job, self._in_flight[job_id] == 0
+
+    def get(self, job_id):
+        with self._lock:
+            return self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+    def list(self, limit=100):
+        with self._lock:
+            return self._conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+
+    def results(self, job_id):
+        with self._lock:
+            return [row["path"] for row in self._conn.execute(
+                "SELECT path FROM results WHERE job_id = ? ORDER BY position", (job_id,))]
+
+def job_summary(job):
+    """Return the public view of a job row."""
+    return {
+        "id": job["id"],
+        "profile": job["profile_key"],
+        "category": job["category"],
+        "count": job["count"],
+        "temperature": job["temperature"],
+        "priority": job["priority"],
+        "status": job["status"],
+        "completed": job["completed"],
+        "failed": job["failed"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"]
+    }
+
+def end_job_run(job):
+    """Write the end record of a finished or cancelled job's run manifest."""
+    append_run_record(agent.SUGGESTIONS_DIR, f"job-{job['id']}",
+                      {"event": "end", "status": job["status"], "successful": job["completed"]})
+
+def resolve_profile_path(name):
+    """Return the path of a profile file in PROFILES_DIR, given its name or its path.
+    
+    Raises ValueError for anything outside PROFILES_DIR, so clients cannot
+    make the server read arbitrary files.
+    """
+    profiles_dir = os.path.realpath(PROFILES_DIR)
+    for candidate in (name, os.path.join(PROFILES_DIR, name)):
+        path = os.path.realpath(candidate)
+        if os.path.commonpath([path, profiles_dir]) == profiles_dir and os.path.isfile(path):
+            return path
+    raise ValueError(f"Unknown profile '{name}'. Send the profile inline or name a file in {PROFILES_DIR}/")
+
+def read_results(job_id, paths):
+    """Return the markdown of a job's saved files, in order.
+    
+    Files that have been packed (see suggestion_archive.py) are read from the
+    job's run archive. Returns None if any file no longer exists.
+    """
+    contents = []
+    archive = None
+    entries = {}
+    try:
+        for path in paths:
+            try:
+                with open(os.path.join(agent.SUGGESTIONS_DIR, path), 'r', encoding='utf-8') as f:
+                    contents.append(f.read())
+                continue
+            except OSError:
+                pass
+            if archive is None:
+                try:
+                    archive = SuggestionArchive(archive_path(agent.SUGGESTIONS_DIR, f"job-{job_id}"))
+                except (OSError, ArchiveError):
+                    return None
+                entries = {entry["path"]: entry for entry in archive.entries}
+            entry = entries.get(path.replace(os.sep, "/"))
+            if entry is None:
+                return None
+            contents.append(archive.read(entry))
+    finally:
+        if archive is not None:
+            archive.close()
+    return contents
+
+def warm_up_model(model, keep_alive, options=None):
+    """Load the model into memory ahead of the first job and keep it there.
+    
+    options are the Ollama options the model is loaded with (e.g. num_ctx);
+    later requests with different load options make Ollama reload it.
+    """
+    payload = {"model": model, "keep_alive": keep_alive}
+    if options:
+        payload["options"] = options
+    try:
+        requests.post(f"{agent.OLLAMA_API_URL}/generate", json=payload, timeout=600)
+        print(f"✅ Model {model} loaded (keep_alive {keep_alive})")
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Could not warm up {model}: {e}")
+
+class Worker(threading.Thread):
+    """Generates suggestions for whichever job the queue hands out next."""
+
+    def __init__(self, queue, model, templates, keep_alive, stop_event, name):
+        super().__init__(name=name, daemon=True)
+        self.queue = queue
+        self.model = model
+        self.templates = templates
+        self.keep_alive = keep_alive
+        self.stop_event = stop_event
+
+    def run(self):
+        while not self.stop_event.is_set():
+            claimed = self.queue.claim()
+            if claimed is None:
+                continue
+            self.process(*claimed)
+
+    def process(self, job, index):
+        job_id = job["id"]
+        run_id = f"job-{job_id}"
+        profile = json.loads(job["profile_json"])
+        usage = {}
+        try:
+            suggestion = agent.generate_suggestion(self.model, profile, job["temperature"],
+                                                   self.templates[job["category"]], job["category"],
+                                                   keep_alive=self.keep_alive, seed_offset=index, usage=usage)
+        except Exception as e:
+            suggestion = None
+            print(f"❌ Job {job_id}: {e}")
+
+        if not suggestion:
+            ended = self.queue.finish_unit(job_id, error="Generation failed")
+            if ended is not None:
+                end_job_run(ended)
+            return
+
+        run_info = {"run_id": run_id, "model": self.model, "temperature": job["temperature"]}
+        path = agent.save_suggestion(suggestion, index, job["category"], run_id, run_info,
+                                     output_dir=os.path.join(JOBS_OUTPUT_DIR, job_id), usage=usage)
+        relative_path = os.path.relpath(path, agent.SUGGESTIONS_DIR) if path else None
+        ended = self.queue.finish_unit(job_id, relative_path, None if path else "Saving failed")
+        if ended is not None:
+            end_job_run(ended)
+            print(f"✅ Job {job_id} {ended['status']}")
+
+def make_handler(queue, model, default_profile_path):
+    """Create a request handler class bound to a job queue."""
+
+    class JobRequestHandler(BaseHTTPRequestHandler):
+        server_version = "IdeationJobServer/1.0"
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload, indent=2).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _route(self):
+            url = urllib.parse.urlsplit(self.path)
+            parts = [part for part in url.path.split("/") if part]
+            return parts, urllib.parse.parse_qs(url.query)
+
+        def do_POST(self):
+            parts, _ = self._route()
+            if parts != ["jobs"]:
+                self._send_json(404, {"error": "Not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                job = self._parse_job(payload)
+            except (ValueError, TypeError, OverflowError, OSError) as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            job_id = queue.submit(**job)
+            append_run_record(agent.SUGGESTIONS_DIR, f"job-{job_id}", {
+                "event": "start", "model": model, "temperature": job["temperature"],
+                "category": job["category"], "requested": job["count"], "profile": job["profile_key"]
+            })
+            self._send_json(201, job_summary(queue.get(job_id)))
+
+        def _parse_job(self, payload):
+            if not isinstance(payload, dict):
+                raise ValueError("The request body must be a JSON object")
+            category = payload.get("category", "side_hustle")
+            if category not in agent.CATEGORIES:
+                raise ValueError(f"Unknown category '{category}'. Choose from: {', '.join(agent.CATEGORIES)}")
+
+            count = int(payload.get("count", 1))
+            if not 1 <= count <= MAX_JOB_SIZE:
+                raise ValueError(f"count must be between 1 and {MAX_JOB_SIZE}")
+
+            if "temperature" in payload:
+                temperature = float(payload["temperature"])
+                if not (math.isfinite(temperature) and 0 <= temperature <= MAX_TEMPERATURE):
+                    raise ValueError(f"temperature must be between 0 and {MAX_TEMPERATURE}")
+            else:
+                creativity = payload.get("creativity", 3)
+                if creativity not in agent.TEMPERATURE_MAP:
+                    raise ValueError(f"creativity must be one of {', '.join(map(str, agent.TEMPERATURE_MAP))}")
+                temperature = agent.TEMPERATURE_MAP[creativity]
+
+            # A profile is either inline JSON or the name of a profile file in PROFILES_DIR
+            profile = payload.get("profile", default_profile_path)
+            if isinstance(profile, str):
+                profile_key = profile
+                with open(resolve_profile_path(profile), 'r') as f:
+                    profile = json.load(f)
+                if not isinstance(profile, dict):
+                    raise ValueError(f"Profile '{profile_key}' is not a JSON object")
+            elif isinstance(profile, dict):
+                user = profile.get("user")
+                profile_key = (user.get("name") if isinstance(user, dict) else None) or "inline"
+            else:
+                raise ValueError("profile must be a JSON object or the name of a profile file")
+
+            return {
+                "profile_key": payload.get("profile_key", profile_key),
+                "profile": profile,
+                "category": category,
+                "count": count,
+                "temperature": temperature,
+                "priority": int(payload.get("priority", 0))
+            }
+
+        def do_GET(self):
+            parts, query = self._route()
+            if parts == ["jobs"]:
+                self._send_json(200, [job_summary(job) for job in queue.list()])
+                return
+            if len(parts) in (2, 3) and parts[0] == "jobs":
+                job = queue.get(parts[1])
+                if job is None:
+                    self._send_json(404, {"error": "Unknown job"})
+                elif len(parts) == 2:
+                    self._send_json(200, job_summary(job))
+                elif parts[2] == "result":
+                    paths = queue.results(job["id"])
+                    files = [{"path": path} for path in paths]
+                    if query.get("content") == ["1"]:
+                        contents = read_results(job["id"], paths)
+                        if contents is None:
+                            self._send_json(410, {"error": "Some of the job's files no longer exist"})
+                            return
+                        for entry, content in zip(files, contents):
+                            entry["content"] = content
+                    self._send_json(200, dict(job_summary(job), files=files))
+                else:
+                    self._send_json(404, {"error": "Not found"})
+                return
+            self._send_json(404, {"error": "Not found"})
+
+        def do_DELETE(self):
+            parts, _ = self._route()
+            cancelled = queue.cancel(parts[1]) if len(parts) == 2 and parts[0] == "jobs" else None
+            if cancelled is None:
+                self._send_json(404, {"error": "Unknown or finished job"})
+                return
+            job, ended = cancelled
+            if ended:
+                end_job_run(job)
+            self._send_json(200, job_summary(job))
+
+        def log_message(self, format, *args):
+            pass
+
+    return JobRequestHandler
+
+def main():
+    """Main function to run the job server."""
+    parser = argparse.ArgumentParser(description="Ideation Job Server")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Concurrent generation requests (match OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--model", help="Model to use (default: best available LLAMA model)")
+    parser.add_argument("--keep-alive", default=DEFAULT_KEEP_ALIVE,
+                        help="How long Ollama keeps the model loaded between requests")
+    parser.add_argument("--db", default=JOBS_DB_PATH, help="Path to the job queue database")
+    args = parser.parse_args()
+
+    print("\n🗂  Ideation Job Server\n")
+
+    if not agent.check_ollama_available():
+        sys.exit(1)
+    model = args.model or agent.get_best_llama_model()
+    templates = {key: agent.load_template(key) for key in agent.CATEGORIES}
+    warm_up_model(model, args.keep_alive)
+
+    queue = JobQueue(args.db)
+    stop_event = threading.Event()
+    workers = [Worker(queue, model, templates, args.keep_alive, stop_event, f"worker-{i + 1}")
+               for i in range(args.workers)]
+    for worker in workers:
+        worker.start()
+
+    httpd = ThreadingHTTPServer((args.host, args.port), make_handler(queue, model, agent.USER_PROFILE_PATH))
+    print(f"✅ Accepting jobs at http://{args.host}:{httpd.server_address[1]}/jobs with {args.workers} worker(s)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping job server; unfinished jobs will resume on the next start.")
+    finally:
+        stop_event.set()
+        httpd.server_close()
+        for worker in workers:
+            worker.join(timeout=5)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Parameter Sweep
+
+Runs a grid of generation settings (model, temperature, num_predict,
+concurrency) against one warm Ollama backend and prints a comparative report,
+so the cheapest configuration that still meets a quality bar can be picked
+from measurements instead of guesswork.
+
+Requests use the same options as the agent, including the context window
+(num_ctx) fitted to the prompt and the cell's num_predict. Cells are grouped
+by model and num_ctx, and the model is warmed up with that num_ctx, so Ollama
+never has to reload it within a group. Within a group cells are interleaved:
+every round generates one batch for each cell in turn, so no cell gets all
+the warm (or all the cold) requests.
+
+For each cell the report shows:
+- suggestions per second (wall clock, including concurrency)
+- prompt and output tokens per suggestion
+- duplicate rate (suggestions whose title and section text overlap an earlier one)
+- how many suggestions have every template section
+- the distribution of the parsed ratings
+
+Example:
+    python scripts/parameter_sweep.py --temperatures 0.5,0.7,0.9 --num-predict 800,1200 \\
+        --concurrency 1,2 --per-cell 4 --min-rating 7 --max-duplicate-rate 0.1
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import collections
+import concurrent.futures
+
+import side_hustle_ideation_agent as agent
+from job_server import warm_up_model, DEFAULT_KEEP_ALIVE
+from suggestion_metadata import parse_suggestion, new_run_id, append_run_record
+from template_validator import find_defects
+
+SWEEPS_DIR = os.path.join(agent.SUGGESTIONS_DIR, ".sweeps")
+DEFAULT_PER_CELL = 3
+
+def parse_list(value, cast):
+    """Parse a comma-separated command line list."""
+    return [cast(item.strip()) for item in value.split(",") if item.strip()]
+
+def cell_label(cell):
+    """Return a short, file-name safe label for a cell."""
+    model = cell["model"].replace(":", "-").replace("/", "-")
+    return f"{model}_t{cell['temperature']}_n{cell['num_predict']}_c{cell['concurrency']}"
+
+def is_duplicate(tokens, seen_tokens):
+    """Return True if tokens overlap any earlier suggestion's by the stub similarity threshold."""
+    return any(len(tokens & other) / len(tokens | other) >= agent.STUB_SIMILARITY_THRESHOLD
+               for other in seen_tokens if tokens | other)
+
+def suggestion_tokens(metadata):
+    """Return the significant words of a suggestion's title and section text, for duplicate checks."""
+    return agent.stub_tokens({"name": metadata["title"], "pitch": " ".join(metadata["sections"].values())})
+
+def fitted_num_ctx(category_key, temperature, num_predict, prompt_chars):
+    """Return the num_ctx the agent would use for a suggestion request with these settings."""
+    options = agent.build_generation_options(category_key, temperature, prompt_chars, num_predict=num_predict)
+    return options["num_ctx"]
+
+def run_batch(cell, size, user_profile, template, category_key, keep_alive):
+    """Generate one batch of suggestions for a cell concurrently.
+
+    Returns (elapsed seconds, [(suggestion, usage)]) for the requests that succeeded.
+    """
+    overrides = {"num_predict": cell["num_predict"], "num_ctx": cell["num_ctx"]}
+
+    def generate(_):
+        usage = {}
+        suggestion = agent.generate_suggestion(cell["model"], user_profile, cell["temperature"], template,
+                                               category_key, keep_alive=keep_alive,
+                                               option_overrides=overrides, usage=usage)
+        return suggestion, usage
+
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=size) as executor:
+        results = list(executor.map(generate, range(size)))
+    return time.perf_counter() - started, [(s, usage) for s, usage in results if s]
+
+def record_results(cell, results, template):
+    """Add a batch's suggestions to a cell's measurements."""
+    for suggestion, usage in results:
+        metadata = parse_suggestion(suggestion)
+        tokens = suggestion_tokens(metadata)
+        if is_duplicate(tokens, cell["seen_tokens"]):
+            cell["duplicates"] += 1
+        cell["seen_tokens"].append(tokens)
+        if not find_defects(suggestion, template):
+            cell["complete"] += 1
+        cell["ratings"].append(metadata["rating"])
+        cell["prompt_tokens"] += usage.get("prompt_tokens", 0)
+        cell["output_tokens"] += usage.get("output_tokens", 0)
+        cell["suggestions"].append(suggestion)
+        cell["usage"].append(usage)
+
+def summarize(cell):
+    """Return the reported figures for a finished cell."""
+    count = len(cell["suggestions"])
+    ratings = [rating for rating in cell["ratings"] if rating is not None]
+    return {
+        "model": cell["model"],
+        "temperature": cell["temperature"],
+        "num_predict": cell["num_predict"],
+        "num_ctx": cell["num_ctx"],
+        "concurrency": cell["concurrency"],
+        "suggestions": count,
+        "failed": cell["failed"],
+        "seconds": round(cell["elapsed"], 3),
+        "suggestions_per_second": round(count / cell["elapsed"], 4) if cell["elapsed"] else 0.0,
+        "prompt_tokens_per_suggestion": round(cell["prompt_tokens"] / count, 1) if count else None,
+        "output_tokens_per_suggestion": round(cell["output_tokens"] / count, 1) if count else None,
+        "duplicate_rate": round(cell["duplicates"] / count, 3) if count else None,
+        "complete_rate": round(cell["complete"] / count, 3) if count else None,
+        "mean_rating": round(sum(ratings) / len(ratings), 2) if ratings else None,
+        "unrated": count - len(ratings),
+        "rating_distribution": dict(sorted(collections.Counter(int(rating) for rating in ratings).items()))
+    }
+
+def meets_quality_bar(summary, args):
+    """Return True if a cell's results satisfy the --min-* / --max-* thresholds."""
+    if not summary["suggestions"]:
+        return False
+    if args.min_rating is not None and (summary["mean_rating"] or 0) < args.min_rating:
+        return False
+    if args.max_duplicate_rate is not None and summary["duplicate_rate"] > args.max_duplicate_rate:
+        return False
+    if args.min_complete_rate is not None and summary["complete_rate"] < args.min_complete_rate:
+        return False
+    return True
+
+def cell_cost(summary, cost):
+    """Return the cost of a cell's configuration: seconds or tokens per suggestion."""
+    if cost == "tokens":
+        return summary["prompt_tokens_per_suggestion"] + summary["output_tokens_per_suggestion"]
+    return 1 / summary["suggestions_per_second"] if summary["suggestions_per_second"] else float("inf")
+
+def print_report(summaries, recommended):
+    """Print the comparison table."""
+    print("\n📊 Sweep results")
+    print(f"  {'model':<20}{'temp':>6}{'n_pred':>8}{'conc':>6}{'done':>6}{'sugg/s':>9}"
+          f"{'tok/sugg':>10}{'dup %':>7}{'full %':>8}{'rating':>8}  distribution")
+    for summary in summaries:
+        marker = "⭐" if summary is recommended else "  "
+        tokens = (summary["prompt_tokens_per_suggestion"] or 0) + (summary["output_tokens_per_suggestion"] or 0)
+        duplicate = f"{summary['duplicate_rate'] * 100:.0f}" if summary["suggestions"] else "-"
+        complete = f"{summary['complete_rate'] * 100:.0f}" if summary["suggestions"] else "-"
+        rating = f"{summary['mean_rating']:.1f}" if summary["mean_rating"] is not None else "-"
+        distribution = " ".join(f"{score}:{n}" for score, n in summary["rating_distribution"].items())
+        print(f"{marker}{summary['model'][:20]:<20}{summary['temperature']:>6}{summary['num_predict']:>8}"
+              f"{summary['concurrency']:>6}{summary['suggestions']:>6}{summary['suggestions_per_second']:>9.3f}"
+              f"{tokens:>10.0f}{duplicate:>7}{complete:>8}{rating:>8}  {distribution}")
+
+def main():
+    """Main function to run a parameter sweep."""
+    parser = argparse.ArgumentParser(description="Ideation Agent Parameter Sweep")
+    parser.add_argument("--models", help="Comma-separated models (default: best available LLAMA model)")
+    parser.add_argument("--temperatures", default=",".join(str(t) for t in agent.TEMPERATURE_MAP.values()),
+                        help="Comma-separated temperatures (default: every creativity level)")
+    parser.add_argument("--num-predict", help="Comma-separated output token caps (default: the category's)")
+    parser.add_argument("--concurrency", default="1", help="Comma-separated numbers of parallel requests")
+    parser.add_argument("--per-cell", type=int, default=DEFAULT_PER_CELL, help="Suggestions to generate per cell")
+    parser.add_argument("--category", default="side_hustle", choices=list(agent.CATEGORIES),
+                        help="Category to generate")
+    parser.add_argument("--num-ctx", type=int,
+                        help="Context window for every request (default: fitted to the prompt, as in the agent)")
+    parser.add_argument("--keep-alive", default=DEFAULT_KEEP_ALIVE,
+                        help="How long Ollama keeps the model loaded between requests")
+    parser.add_argument("--min-rating", type=float, help="Quality bar: lowest acceptable mean rating")
+    parser.add_argument("--max-duplicate-rate", type=float, help="Quality bar: highest acceptable duplicate rate")
+    parser.add_argument("--min-complete-rate", type=float,
+                        help="Quality bar: lowest acceptable share of suggestions with every template section")
+    parser.add_argument("--cost", choices=["time", "tokens"], default="time",
+                        help="What makes a configuration cheap: seconds or tokens per suggestion")
+    parser.add_argument("--save", action="store_true",
+                        help="Also save the generated suggestions under example-suggestions/sweeps/<sweep id>/")
+    args = parser.parse_args()
+
+    print("\n🧪 Ideation Agent Parameter Sweep\n")
+
+    if not agent.check_ollama_available():
+        sys.exit(1)
+    models = parse_list(args.models, str) if args.models else [agent.get_best_llama_model()]
+    profile = agent.load_generation_profile(args.category)
+    temperatures = parse_list(args.temperatures, float)
+    num_predicts = parse_list(args.num_predict, int) if args.num_predict else [profile["num_predict"]]
+    concurrencies = parse_list(args.concurrency, int)
+
+    user_profile = agent.load_user_profile()
+    template = agent.load_template(args.category)
+    sweep_id = new_run_id()
+    prompt_chars = sum(map(len, agent.build_suggestion_prompts(user_profile, template, args.category)))
+
+    cells = [
+        {"model": model, "temperature": temperature, "num_predict": num_predict, "concurrency": concurrency,
+         "num_ctx": args.num_ctx or fitted_num_ctx(args.category, temperature, num_predict, prompt_chars),
+         "elapsed": 0.0, "failed": 0, "prompt_tokens": 0, "output_tokens": 0, "duplicates": 0, "complete": 0,
+         "ratings": [], "seen_tokens": [], "suggestions": [], "usage": []}
+        for model in models
+        for temperature in temperatures
+        for num_predict in num_predicts
+        for concurrency in concurrencies
+    ]
+    print(f"Sweeping {len(cells)} cell(s) x {args.per_cell} suggestion(s)")
+
+    groups = list(dict.fromkeys((cell["model"], cell["num_ctx"]) for cell in cells))
+    for model, num_ctx in groups:
+        warm_up_model(model, args.keep_alive, {"num_ctx": num_ctx})
+        group_cells = [cell for cell in cells if (cell["model"], cell["num_ctx"]) == (model, num_ctx)]
+        round_number = 0
+        while any(len(cell["suggestions"]) + cell["failed"] < args.per_cell for cell in group_cells):
+            round_number += 1
+            print(f"\n🔁 {model} (num_ctx {num_ctx}): round {round_number}")
+            for cell in group_cells:
+                remaining = args.per_cell - len(cell["suggestions"]) - cell["failed"]
+                if remaining <= 0:
+                    continue
+                size = min(cell["concurrency"], remaining)
+                elapsed, results = run_batch(cell, size, user_profile, template, args.category, args.keep_alive)
+                cell["elapsed"] += elapsed
+                cell["failed"] += size - len(results)
+                record_results(cell, results, template)
+                print(f"  {cell_label(cell)}: {len(results)}/{size} in {elapsed:.1f}s")
+
+    summaries = [summarize(cell) for cell in cells]
+    passing = [summary for summary in summaries if meets_quality_bar(summary, args)]
+    recommended = min(passing, key=lambda summary: cell_cost(summary, args.cost)) if passing else None
+    print_report(summaries, recommended)
+    if recommended:
+        print(f"\n⭐ Cheapest configuration meeting the quality bar (by {args.cost}): "
+              f"model {recommended['model']}, temperature {recommended['temperature']}, "
+              f"num_predict {recommended['num_predict']}, concurrency {recommended['concurrency']}")
+    else:
+        print("\n❌ No configuration met the quality bar.")
+
+    if args.save:
+        for cell in cells:
+            run_id = f"sweep-{sweep_id}-{cell_label(cell)}"
+            run_info = {"run_id": run_id, "model": cell["model"], "temperature": cell["temperature"],
+                        "creativity": agent.creativity_for_temperature(cell["temperature"])}
+            append_run_record(agent.SUGGESTIONS_DIR, run_id, dict(run_info, event="start", category=args.category,
+                                                                  num_predict=cell["num_predict"],
+                                                                  num_ctx=cell["num_ctx"],
+                                                                  concurrency=cell["concurrency"]))
+            output_dir = os.path.join(agent.SUGGESTIONS_DIR, "sweeps", sweep_id, cell_label(cell))
+            for i, suggestion in enumerate(cell["suggestions"]):
+                agent.save_suggestion(suggestion, i, args.category, run_id=run_id, run_info=run_info,
+                                      output_dir=output_dir, usage=cell["usage"][i])
+            append_run_record(agent.SUGGESTIONS_DIR, run_id, {"event": "end", "successful": len(cell["suggestions"])})
+
+    os.makedirs(SWEEPS_DIR, exist_ok=True)
+    report_path = os.path.join(SWEEPS_DIR, f"{sweep_id}.json")
+    report = {
+        "sweep_id": sweep_id,
+        "category": args.category,
+        "per_cell": args.per_cell,
+        "num_ctx": args.num_ctx,
+        "quality_bar": {"min_rating": args.min_rating, "max_duplicate_rate": args.max_duplicate_rate,
+                        "min_complete_rate": args.min_complete_rate},
+        "cost": args.cost,
+        "cells": summaries,
+        "recommended": recommended
+    }
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"📁 Report saved to {report_path}")
+
+if __name__ == "__main__":
+    main()
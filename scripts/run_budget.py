@@ -0,0 +1,237 @@
+"""
+Run Budget
+
+Wall-clock and token budgets for an ideation run. The agent asks the budget
+before starting each suggestion whether it is still projected to fit, and
+reports every finished suggestion back with its token counts and duration.
+
+Projections use live estimates: exponentially weighted averages of the wall
+time and tokens per suggestion for each category (falling back to the run
+average for categories without samples yet), and the generation speed Ollama
+reports (eval_count / eval_duration). Requests that are still in flight
+reserve their estimated tokens, so concurrent workers don't overshoot the
+token budget together.
+"""
+
+import re
+import time
+import threading
+
+# Weight of the newest sample in the running averages
+SMOOTHING = 0.3
+# Only start a suggestion if its estimated duration fits this many times into the time left
+TIME_SAFETY_FACTOR = 1.2
+
+DURATION_PATTERN = re.compile(r'(?:(\d+(?:\.\d+)?)h)?(?:(\d+(?:\.\d+)?)m)?(?:(\d+(?:\.\d+)?)s?)?')
+COUNT_SUFFIXES = {"k": 1_000, "m": 1_000_000, "g": 1_000_000_000}
+
+def parse_duration(value):
+    """Parse a duration like "2h", "90m", "1h30m" or "45" (seconds) into seconds."""
+    match = DURATION_PATTERN.fullmatch(value.strip().lower().replace(" ", ""))
+    if not match or not any(match.groups()):
+        raise ValueError(f"invalid duration: {value!r}")
+    hours, minutes, seconds = (float(part or 0) for part in match.groups())
+    return hours * 3600 + minutes * 60 + seconds
+
+def parse_count(value):
+    """Parse a count like "3M", "500k" or "250000"."""
+    text = value.strip().lower().replace(",", "").replace("_", "")
+    multiplier = COUNT_SUFFIXES.get(text[-1:], 1)
+    if multiplier != 1:
+        text = text[:-1]
+    return int(float(text) * multiplier)
+
+def format_duration(seconds):
+    """Format seconds as e.g. "1h05m", "12m30s" or "40s"."""
+    seconds = max(0, int(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+def format_count(count):
+    """Format a token count as e.g. "2.1M" or "350k"."""
+    if count >= 1_000_000:
+        return f"{count / 1_000_000:.1f}M"
+    if count >= 1_000:
+        return f"{count / 1_000:.0f}k"
+    return str(int(count))
+
+class RunningAverage:
+    """Exponentially weighted average that starts at its first sample."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = None
+
+    def add(self, sample):
+        self.value = sample if self.value is None else SMOOTHING * sample + (1 - SMOOTHING) * self.value
+
+class RunBudget:
+    """Tracks a run's time and token budgets and projects what still fits."""
+
+    def __init__(self, category_keys, deadline_seconds=None, token_budget=None, concurrency=1):
+        self.category_keys = list(category_keys)
+        self.concurrency = concurrency
+        self.started = time.monotonic()
+        self.deadline = self.started + deadline_seconds if deadline_seconds else None
+        self.token_budget = token_budget
+        self.tokens_used = 0
+        self.completed = {}
+        self.stop_reason = None
+        self._seconds = {}
+        self._tokens = {}
+        self._run_seconds = RunningAverage()
+        self._run_tokens = RunningAverage()
+        self._eval_rate = RunningAverage()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def time_left(self):
+        """Return the seconds left before the deadline, or None without one."""
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+    def tokens_left(self):
+        """Return the tokens left in the budget, or None without one."""
+        return None if self.token_budget is None else self.token_budget - self.tokens_used
+
+    def out_of_time(self):
+        """Return True once the deadline has passed."""
+        return self.deadline is not None and self.time_left() <= 0
+
+    def request_timeout(self):
+        """Return how long a request may wait for Ollama without running past the deadline."""
+        return None if self.deadline is None else max(1.0, self.time_left())
+
+    def estimate(self, category_key):
+        """Return (seconds, tokens) expected for one suggestion of a category, or None if unknown."""
+        seconds = self._seconds.get(category_key, self._run_seconds).value
+        tokens = self._tokens.get(category_key, self._run_tokens).value
+        return seconds, tokens
+
+    def fits(self, category_key):
+        """Return True if one more suggestion of a category is projected to fit.
+
+        Otherwise records why not (the deadline or the token budget) as the
+        stop reason.
+        """
+        with self._lock:
+            return self._fits(category_key)
+
+    def try_start(self, category_key):
+        """Reserve room for one more suggestion if it is projected to fit.
+
+        Returns False when it doesn't (see fits()). Every successful call must
+        be followed by finish().
+        """
+        with self._lock:
+            if not self._fits(category_key):
+                return False
+            self._in_flight[category_key] = self._in_flight.get(category_key, 0) + 1
+            return True
+
+    def _fits(self, category_key):
+        seconds, tokens = self.estimate(category_key)
+        time_left = self.time_left()
+        if time_left is not None and time_left <= (seconds or 0) * TIME_SAFETY_FACTOR:
+            self.stop_reason = "deadline"
+            return False
+        tokens_left = self.tokens_left()
+        if tokens_left is not None:
+            reserved = sum((self.estimate(key)[1] or 0) * count for key, count in self._in_flight.items())
+            if tokens_left - reserved <= (tokens or 0):
+                self.stop_reason = "token budget"
+                return False
+        self.stop_reason = None
+        return True
+
+    def record_tokens(self, usage):
+        """Charge tokens spent outside a suggestion (e.g. idea stubs) to the budget."""
+        with self._lock:
+            self.tokens_used += usage.get("prompt_tokens", 0) + usage.get("output_tokens", 0)
+
+    def finish(self, category_key, usage, elapsed, saved=True):
+        """Record a finished suggestion attempt started with try_start()."""
+        with self._lock:
+            self._in_flight[category_key] = max(0, self._in_flight.get(category_key, 0) - 1)
+            tokens = usage.get("prompt_tokens", 0) + usage.get("output_tokens", 0)
+            self.tokens_used += tokens
+            if usage.get("eval_seconds"):
+                self._eval_rate.add(usage.get("output_tokens", 0) / usage["eval_seconds"])
+            if not saved:
+                return
+            self.completed[category_key] = self.completed.get(category_key, 0) + 1
+            self._seconds.setdefault(category_key, RunningAverage()).add(elapsed)
+            self._tokens.setdefault(category_key, RunningAverage()).add(tokens)
+            self._run_seconds.add(elapsed)
+            self._run_tokens.add(tokens)
+
+    def capacity(self):
+        """Project how many more suggestions fit, shared out across the run's categories.
+
+        Each category's share is costed with its own estimates, and categories
+        that are behind get the remainder first so the mix evens out. Returns
+        {category: projected count}, or None while there is nothing to project
+        from (no budget, no finished suggestion yet, or no measured cost).
+        """
+        category_keys = self.category_keys
+        estimates = [self.estimate(key) for key in category_keys]
+        if any(seconds is None or tokens is None for seconds, tokens in estimates):
+            return None
+        # One round makes one suggestion of every category
+        round_seconds = sum(seconds for seconds, _ in estimates) / self.concurrency
+        round_tokens = sum(tokens for _, tokens in estimates)
+        # A budget only limits the projection if suggestions are measured to use it
+        limits = []
+        if self.deadline is not None and round_seconds > 0:
+            limits.append(max(0.0, self.time_left()) / round_seconds)
+        if self.token_budget is not None and round_tokens > 0:
+            limits.append(max(0, self.tokens_left()) / round_tokens)
+        if not limits:
+            return None
+        rounds = min(limits)
+        total = int(rounds * len(category_keys))
+        done = {key: self.completed.get(key, 0) for key in category_keys}
+        # Raise the categories that are furthest behind level by level, then share out the rest evenly
+        order = sorted(category_keys, key=done.get)
+        levels = dict(done)
+        for i in range(1, len(order) + 1):
+            group = order[:i]
+            level = levels[order[0]]
+            if i < len(order) and (done[order[i]] - level) * i <= total:
+                total -= (done[order[i]] - level) * i
+                levels.update((key, done[order[i]]) for key in group)
+                continue
+            share, extra = divmod(total, i)
+            for j, key in enumerate(group):
+                levels[key] += share + (1 if j < extra else 0)
+            break
+        return {key: levels[key] - done[key] for key in category_keys}
+
+    def progress(self):
+        """Return a one-line status with the budget left and the projection."""
+        parts = [f"{sum(self.completed.values())} done"]
+        if self.deadline is not None:
+            parts.append(f"{format_duration(self.time_left())} left")
+        if self.token_budget is not None:
+            parts.append(f"{format_count(max(0, self.tokens_left()))} tokens left")
+        if self._eval_rate.value:
+            parts.append(f"{self._eval_rate.value:.0f} tok/s")
+        plan = self.capacity()
+        if plan is not None:
+            parts.append(f"~{sum(plan.values())} more fit")
+        return ", ".join(parts)
+
+    def summary(self):
+        """Return the budget figures recorded in the run manifest."""
+        return {
+            "deadline_seconds": round(self.deadline - self.started) if self.deadline is not None else None,
+            "token_budget": self.token_budget,
+            "elapsed_seconds": round(time.monotonic() - self.started, 1),
+            "tokens_used": self.tokens_used,
+            "completed": dict(self.completed),
+            "stop_reason": self.stop_reason,
+            "eval_tokens_per_second": round(self._eval_rate.value, 1) if self._eval_rate.value else None
+        }
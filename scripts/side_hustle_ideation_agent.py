@@ -21,7 +21,16 @@ import datetime
 import sys
 import re
 import argparse
+import functools
 import importlib.util
+import concurrent.futures
+
+from suggestion_metadata import new_run_id, append_run_record
+from suggestion_catalog import catalog_saved_suggestion
+from stage_profiler import PROFILER, add_profile_arguments, configure_profiler
+from template_validator import find_defects, parse_repair_response, split_sections, splice_sections
+from corpus_coverage import load_coverage_map, steering_hints
+from run_budget import RunBudget, parse_duration, parse_count, format_duration, format_count
 
 # Constants
 OLLAMA_API_URL = "http://localhost:11434/api"
@@ -29,6 +38,48 @@ USER_PROFILE_PATH = "user-data/user-profile.json"
 SUGGESTIONS_DIR = "example-suggestions"
 TEMPLATE_PATH = "agent-configuration/side-hustles/response-template.md"
 
+# Generation options sent to Ollama. Each category can override these in
+# agent-configuration/<category>/generation-options.json
+GENERATION_OPTIONS_FILE = "generation-options.json"
+DEFAULT_GENERATION_OPTIONS = {
+    # Output caps per request kind
+    "num_predict": 1200,
+    "stub_num_predict": 2048,
+    "repair_num_predict_per_section": 320,
+    # The context window is sized to prompt + output, rounded up to a
+    # multiple of num_ctx_step and clamped to [num_ctx_min, num_ctx_max].
+    # Coarse steps keep requests in the same bucket, since Ollama reloads
+    # the model whenever num_ctx changes.
+    "num_ctx_min": 2048,
+    "num_ctx_max": 8192,
+    "num_ctx_step": 2048,
+    # Base seed for reproducible runs; suggestion N uses seed + N. null = random
+    "seed": None,
+    # Extra sampling options per creativity level (1-5), applied on top of the temperature
+    "creativity": {}
+}
+# Rough prompt size estimate used to fit num_ctx
+CHARS_PER_TOKEN = 3.5
+
+# Two-stage pipeline settings
+STUBS_PER_REQUEST = 40
+STUB_OVERSAMPLING = 3
+STUB_SIMILARITY_THRESHOLD = 0.6
+STUB_STOPWORDS = {"a", "an", "the", "and", "or", "for", "of", "to", "in", "on", "with", "as", "by", "at", "your"}
+
+# Budgeted runs (--deadline / --token-budget)
+MAX_CONSECUTIVE_FAILURES = 3
+PIPELINE_BATCH = 10
+
+# Map creativity level (1-5) to temperature
+TEMPERATURE_MAP = {
+    1: 0.3,
+    2: 0.5,
+    3: 0.7,
+    4: 0.9,
+    5: 1.1
+}
+
 # Category constants
 CATEGORIES = {
     "side_hustle": {
@@ -110,7 +161,7 @@ def get_best_llama_model():
 def load_user_profile():
     """Load the user profile from JSON file."""
     try:
-        with open(USER_PROFILE_PATH, 'r') as f:
+        with PROFILER.span("profile load"), open(USER_PROFILE_PATH, 'r') as f:
             return json.load(f)
     except Exception as e:
         print(f"❌ Error loading user profile: {e}")
@@ -120,14 +171,19 @@ def load_template(category_key="side_hustle"):
     """Load the suggestion template for the specified category."""
     template_path = CATEGORIES[category_key]["template"]
     try:
-        with open(template_path, 'r') as f:
+        with PROFILER.span("template load"), open(template_path, 'r') as f:
             return f.read()
     except Exception as e:
         print(f"❌ Error loading template for {CATEGORIES[category_key]['name']}: {e}")
         sys.exit(1)
 
-def get_user_parameters():
-    """Get parameters from user: category, number of suggestions and creativity level."""
+def get_user_parameters(budgeted=False):
+    """Get parameters from user: category, number of suggestions and creativity level.
+    
+    With budgeted set (a --deadline or --token-budget run), the user can also
+    choose to generate as many suggestions as the budget allows, in which
+    case the number of suggestions is None.
+    """
     # First, let the user select a category or balanced mode
     print("\nWhat type of career exploration suggestions would you like to generate?")
     for i, (key, category) in enumerate(CATEGORIES.items(), 1):
@@ -155,6 +211,10 @@ def get_user_parameters():
     for i, count in enumerate(suggestion_options, 1):
         print(f"{i}: {count} suggestions")
     print(f"{len(suggestion_options) + 1}: Custom number")
+    max_choice = len(suggestion_options) + 1
+    if budgeted:
+        max_choice += 1
+        print(f"{max_choice}: As many as the budget allows")
     
     while True:
         try:
@@ -168,7 +228,10 @@ def get_user_parameters():
                     print("Please enter a positive number.")
                     continue
                 break
-            print(f"Please enter a number between 1 and {len(suggestion_options) + 1}.")
+            elif budgeted and count_choice == max_choice:
+                num_suggestions = None
+                break
+            print(f"Please enter a number between 1 and {max_choice}.")
         except ValueError:
             print("Please enter a valid number.")
     
@@ -184,19 +247,97 @@ def get_user_parameters():
         except ValueError:
             print("Please enter a valid number.")
     
-    # Map creativity level to temperature
-    temperature_map = {
-        1: 0.3,
-        2: 0.5,
-        3: 0.7,
-        4: 0.9,
-        5: 1.1
+    return category_key, num_suggestions, creativity, TEMPERATURE_MAP[creativity], balanced_mode
+
+@functools.lru_cache(maxsize=None)
+def load_generation_profile(category_key):
+    """Load a category's generation options, falling back to the defaults."""
+    profile = dict(DEFAULT_GENERATION_OPTIONS)
+    config_dir = os.path.dirname(CATEGORIES[category_key]["template"])
+    config_path = os.path.join(config_dir, GENERATION_OPTIONS_FILE)
+    if os.path.exists(config_path):
+        try:
+            with open(config_path, 'r') as f:
+                profile.update(json.load(f))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"❌ Error loading {config_path}, using default generation options: {e}")
+    return profile
+
+def creativity_for_temperature(temperature):
+    """Return the creativity level whose temperature is closest to the given one."""
+    return min(TEMPERATURE_MAP, key=lambda level: abs(TEMPERATURE_MAP[level] - temperature))
+
+def build_generation_options(category_key, temperature, prompt_chars, kind="suggestion", num_predict=None,
+                             seed_offset=None, overrides=None):
+    """Build the Ollama "options" for one request.
+    
+    kind is "suggestion", "stubs" or "repair" and selects the output cap
+    unless num_predict is given. seed_offset is added to the profile's base
+    seed so every suggestion in a seeded run is different but reproducible.
+    overrides are applied last (e.g. by a parameter sweep).
+    """
+    profile = load_generation_profile(category_key)
+    if num_predict is None:
+        num_predict = profile["stub_num_predict"] if kind == "stubs" else profile["num_predict"]
+    
+    options = {"temperature": temperature}
+    options.update(profile["creativity"].get(str(creativity_for_temperature(temperature)), {}))
+    options["num_predict"] = num_predict
+    
+    if profile["seed"] is not None:
+        options["seed"] = profile["seed"] + (seed_offset or 0)
+    if overrides:
+        options.update(overrides)
+    
+    # Fit the context window to this prompt plus the output cap
+    needed = int(prompt_chars / CHARS_PER_TOKEN) + options["num_predict"]
+    step = profile["num_ctx_step"]
+    options.setdefault("num_ctx", max(profile["num_ctx_min"], min(profile["num_ctx_max"], -(-needed // step) * step)))
+    return options
+
+def ollama_generate(model, prompt, options, system=None, keep_alive=None, response_format=None, timeout=None):
+    """Send one non-streaming generate request to Ollama.
+    
+    options are Ollama's model options (temperature, num_predict, num_ctx,
+    seed, ...). timeout, if given, is the longest to wait for the response in
+    seconds. Returns the decoded response (with "response" and Ollama's
+    timing and token counts), or None if the request failed.
+    """
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "options": options,
+        "stream": False
     }
+    if system is not None:
+        payload["system"] = system
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    if response_format is not None:
+        payload["format"] = response_format
     
-    return category_key, num_suggestions, creativity, temperature_map[creativity], balanced_mode
+    try:
+        with PROFILER.span("request"):
+            response = requests.post(f"{OLLAMA_API_URL}/generate", json=payload, timeout=timeout)
+        
+        if response.status_code == 200:
+            with PROFILER.span("decode"):
+                result = response.json()
+            record_ollama_timings(result)
+            return result
+        else:
+            print(f"❌ Error generating suggestion: {response.status_code}")
+            print(response.text)
+            return None
+    except Exception as e:
+        print(f"❌ Error calling Ollama API: {e}")
+        return None
 
-def generate_suggestion(model, user_profile, temperature, template, category_key):
-    """Generate a suggestion using the Ollama API based on the selected category."""
+def build_suggestion_prompts(user_profile, template, category_key, idea=None, hints=None):
+    """Return the (system prompt, user prompt) for one suggestion of a category.
+    
+    idea and hints are as for generate_suggestion().
+    """
     # Prepare the system prompt based on category
     system_prompts = {
         "side_hustle": """You are Side Hustle Maverick, an AI assistant specialized in generating creative and personalized side hustle ideas.
@@ -319,28 +460,363 @@ Ensure the job title is descriptive and concise (maximum 3 words).
 
     system_prompt = system_prompts[category_key]
     user_prompt = user_prompts[category_key]
+    if idea:
+        user_prompt += f"""
+DEVELOP THIS SPECIFIC IDEA (use its name as the suggestion's name):
+{idea['name']}: {idea['pitch']}
+"""
+    elif hints:
+        user_prompt += "\n" + hints
+    return system_prompt, user_prompt
 
-    try:
-        response = requests.post(
-            f"{OLLAMA_API_URL}/generate",
-            json={
-                "model": model,
-                "prompt": user_prompt,
-                "system": system_prompt,
-                "temperature": temperature,
-                "stream": False
-            }
-        )
+def generate_suggestion(model, user_profile, temperature, template, category_key, keep_alive=None, idea=None,
+                        seed_offset=None, option_overrides=None, usage=None, hints=None, timeout=None):
+    """Generate a suggestion using the Ollama API based on the selected category.
+    
+    keep_alive, if given, tells Ollama how long to keep the model loaded
+    after the request (e.g. "30m"). idea, if given, is an idea stub
+    ({"name", "pitch"}) from the two-stage pipeline to expand, instead of
+    letting the model come up with the idea itself. seed_offset and
+    option_overrides are passed on to build_generation_options(). usage, if
+    given, is a dict that receives Ollama's token counts and durations for
+    the request (see add_usage()).
+    hints is coverage guidance (see load_steering_hints()) added to the prompt.
+    timeout is passed on to ollama_generate().
+    """
+    prompt_started = time.perf_counter()
+    system_prompt, user_prompt = build_suggestion_prompts(user_profile, template, category_key, idea, hints)
+    options = build_generation_options(category_key, temperature, len(system_prompt) + len(user_prompt),
+                                       seed_offset=seed_offset, overrides=option_overrides)
+    PROFILER.record("prompt", time.perf_counter() - prompt_started)
+
+    result = ollama_generate(model, user_prompt, options, system=system_prompt, keep_alive=keep_alive,
+                             timeout=timeout)
+    if result and usage is not None:
+        add_usage(usage, result)
+    return result.get("response", "") if result else None
+
+def add_usage(usage, result):
+    """Add the token counts and durations (in seconds) of an Ollama response to a usage dict."""
+    usage["prompt_tokens"] = usage.get("prompt_tokens", 0) + result.get("prompt_eval_count", 0)
+    usage["output_tokens"] = usage.get("output_tokens", 0) + result.get("eval_count", 0)
+    for field, key in (("load_duration", "load_seconds"), ("prompt_eval_duration", "prompt_seconds"),
+                       ("eval_duration", "eval_seconds"), ("total_duration", "total_seconds")):
+        if result.get(field):
+            usage[key] = round(usage.get(key, 0) + result[field] / 1e9, 3)
+
+def repair_suggestion(model, temperature, suggestion, template, category_key, max_repairs=1, keep_alive=None,
+                      usage=None, timeout=None):
+    """Check a suggestion against its template and regenerate only the defective sections.
+    
+    Sections that are missing, empty or (for the rating) malformed are
+    requested in a short follow-up call and spliced into the suggestion,
+    up to max_repairs times. usage, if given, receives the repair calls'
+    token counts and durations. Returns (suggestion, remaining defects).
+    """
+    with PROFILER.span("validate"):
+        defects = find_defects(suggestion, template)
+    
+    template_bodies = {heading: body for heading, body in split_sections(template) if heading}
+    for _ in range(max_repairs):
+        if not defects:
+            break
+        print(f"🔧 Repairing {len(defects)} section(s): {', '.join(f'{h} ({r})' for h, r in defects.items())}")
         
-        if response.status_code == 200:
-            return response.json().get("response", "")
-        else:
-            print(f"❌ Error generating suggestion: {response.status_code}")
-            print(response.text)
-            return None
-    except Exception as e:
-        print(f"❌ Error calling Ollama API: {e}")
+        wanted = "\n".join(f"## {heading}\n{template_bodies.get(heading, '')}\n" for heading in defects)
+        prompt = f"""The following {CATEGORIES[category_key]['name'].lower()} document is incomplete.
+Write ONLY the sections listed under SECTIONS TO WRITE, consistent with the rest of the document.
+Start each section with its exact "## " heading and replace the {{{{PLACEHOLDERS}}}} with real content.
+Do not repeat any other section.
+
+DOCUMENT:
+{suggestion}
+
+SECTIONS TO WRITE:
+{wanted}"""
+        per_section = load_generation_profile(category_key)["repair_num_predict_per_section"]
+        options = build_generation_options(category_key, temperature, len(prompt), "repair",
+                                           num_predict=per_section * len(defects))
+        result = ollama_generate(model, prompt, options, keep_alive=keep_alive, timeout=timeout)
+        if not result:
+            break
+        if usage is not None:
+            add_usage(usage, result)
+        
+        sections = parse_repair_response(result.get("response", ""), defects)
+        if sections:
+            suggestion = splice_sections(suggestion, sections, template)
+        with PROFILER.span("validate"):
+            defects = find_defects(suggestion, template)
+    
+    if defects:
+        print(f"⚠️ Suggestion still has defective sections: {', '.join(defects)}")
+    return suggestion, defects
+
+def generate_idea_stubs(model, user_profile, temperature, category_key, count, keep_alive=None, seed_offset=None,
+                        hints=None, usage=None, timeout=None):
+    """Ask the model for a list of short idea stubs (stage one of the pipeline).
+    
+    Returns a list of {"name", "pitch", "score"} dicts; may be shorter than
+    count if the model returns fewer ideas. hints is optional coverage
+    guidance added to the prompt. usage, if given, receives the request's
+    token counts and durations; timeout is passed on to ollama_generate().
+    """
+    category_name = CATEGORIES[category_key]["name"]
+    prompt = f"""Based on the following user profile, brainstorm {count} distinct {category_name.lower()}.
+Do NOT write full descriptions. For each idea give only:
+- "name": a descriptive, concise name (maximum 3 words)
+- "pitch": one sentence explaining the idea and why it suits the user
+- "score": how promising the idea is for this user, from 1 to 10
+
+Every idea must be clearly different from the others.
+Respond with JSON only, in the form {{"ideas": [{{"name": "...", "pitch": "...", "score": 7}}]}}
+
+USER PROFILE:
+{json.dumps(user_profile, indent=2)}
+"""
+    if hints:
+        prompt += "\n" + hints
+    options = build_generation_options(category_key, temperature, len(prompt), "stubs", seed_offset=seed_offset)
+    result = ollama_generate(model, prompt, options, keep_alive=keep_alive, response_format="json",
+                             timeout=timeout)
+    if not result:
+        return []
+    if usage is not None:
+        add_usage(usage, result)
+    with PROFILER.span("parse stubs"):
+        return parse_idea_stubs(result.get("response", ""))
+
+def parse_idea_stubs(text):
+    """Parse the stub list returned by the model, tolerating loose JSON."""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        # Fall back to "Name: pitch" lines
+        return [
+            {"name": match.group(1).strip(), "pitch": match.group(2).strip(), "score": 0}
+            for match in re.finditer(r'^\s*(?:[-*]|\d+\.)?\s*([^:\n]{3,60}):\s*(.+)$', text, re.MULTILINE)
+        ]
+    
+    if isinstance(data, dict):
+        data = data.get("ideas") or next((v for v in data.values() if isinstance(v, list)), [])
+    
+    stubs = []
+    for item in data if isinstance(data, list) else []:
+        if not isinstance(item, dict) or not str(item.get("name", "")).strip():
+            continue
+        try:
+            score = float(item.get("score", 0))
+        except (TypeError, ValueError):
+            score = 0
+        stubs.append({"name": str(item["name"]).strip(), "pitch": str(item.get("pitch", "")).strip(), "score": score})
+    return stubs
+
+def stub_tokens(stub):
+    """Return the set of significant lower-case words in a stub's name and pitch."""
+    words = re.findall(r'[a-z0-9]+', f"{stub['name']} {stub['pitch']}".lower())
+    return {word for word in words if word not in STUB_STOPWORDS}
+
+def select_idea_stubs(stubs, count):
+    """Deduplicate and rank idea stubs, returning the best count of them.
+    
+    A stub is a duplicate if its name matches an earlier one or its words
+    overlap an earlier stub's by at least STUB_SIMILARITY_THRESHOLD (Jaccard).
+    """
+    ranked = sorted(stubs, key=lambda stub: stub["score"], reverse=True)
+    selected = []
+    seen_names = set()
+    selected_tokens = []
+    for stub in ranked:
+        name_key = " ".join(re.findall(r'[a-z0-9]+', stub["name"].lower()))
+        tokens = stub_tokens(stub)
+        if name_key in seen_names:
+            continue
+        if any(len(tokens & other) / len(tokens | other) >= STUB_SIMILARITY_THRESHOLD
+               for other in selected_tokens if tokens | other):
+            continue
+        seen_names.add(name_key)
+        selected_tokens.append(tokens)
+        selected.append(stub)
+        if len(selected) >= count:
+            break
+    return selected
+
+def run_pipeline(model, user_profile, temperature, category_key, count, workers, run_id=None, run_info=None,
+                 use_catalog=False, max_repairs=0, hints=None, budget=None, index_offset=0):
+    """Generate suggestions in two stages and save them.
+    
+    Stage one collects cheap idea stubs (several per requested suggestion),
+    which are deduplicated and ranked locally. Stage two expands only the
+    selected stubs into full template-shaped suggestions, several at a time,
+    repairing defective sections if max_repairs is set. hints (coverage
+    guidance) steer the stubs, and with them the expanded suggestions.
+    With a RunBudget, stubs are charged to it and a stub is only expanded
+    while the budget is projected to allow it. index_offset numbers the
+    suggestions after those of earlier batches in the same run.
+    Returns the number of suggestions saved.
+    """
+    if count <= 0:
+        return 0
+    category_name = CATEGORIES[category_key]["name"]
+    wanted_stubs = count * STUB_OVERSAMPLING
+    
+    # Stage one: idea fan-out
+    print(f"\n💡 Brainstorming {wanted_stubs} {category_name} idea stubs...")
+    stubs = []
+    selected = []
+    max_requests = -(-wanted_stubs // STUBS_PER_REQUEST) + 2
+    for attempt in range(max_requests):
+        # Don't spend tokens on stubs that no expansion would fit after
+        if budget and (budget.out_of_time() or not budget.fits(category_key)):
+            break
+        usage = {}
+        stubs.extend(generate_idea_stubs(model, user_profile, temperature, category_key,
+                                         min(STUBS_PER_REQUEST, wanted_stubs), seed_offset=index_offset + attempt,
+                                         hints=hints,
+                                         usage=usage, timeout=budget and budget.request_timeout()))
+        if budget:
+            budget.record_tokens(usage)
+        selected = select_idea_stubs(stubs, count)
+        if len(stubs) >= wanted_stubs and len(selected) >= count:
+            break
+    
+    print(f"✅ {len(stubs)} stubs, {len(selected)} distinct ideas selected for expansion")
+    if not selected:
+        return 0
+    
+    # Stage two: expand the selected stubs in parallel
+    template = load_template(category_key)
+    
+    def expand(stub):
+        usage = {}
+        if budget and not budget.try_start(category_key):
+            return None, usage, None
+        started = time.monotonic()
+        timeout = budget and budget.request_timeout()
+        suggestion = generate_suggestion(model, user_profile, temperature, template, category_key, idea=stub,
+                                         seed_offset=index_offset + selected.index(stub), usage=usage, timeout=timeout)
+        if suggestion and max_repairs:
+            suggestion, _ = repair_suggestion(model, temperature, suggestion, template, category_key, max_repairs,
+                                              usage=usage, timeout=timeout)
+        return suggestion, usage, time.monotonic() - started
+    
+    successful = 0
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = {executor.submit(expand, stub): index for index, stub in enumerate(selected)}
+        for future in concurrent.futures.as_completed(futures):
+            index = futures[future]
+            suggestion, usage, elapsed = future.result()
+            if elapsed is None:
+                continue  # Skipped: the budget ran out
+            print(f"\n🧠 Expanded '{selected[index]['name']}' ({index + 1}/{len(selected)})")
+            saved = bool(suggestion) and bool(save_suggestion(suggestion, index_offset + index, category_key, run_id,
+                                                              run_info, use_catalog, usage=usage))
+            successful += saved
+            if budget:
+                budget.finish(category_key, usage, elapsed, saved)
+                print(f"⏱️ {budget.progress()}")
+    finally:
+        # On Ctrl+C, drop the expansions that haven't started instead of running them unsaved
+        executor.shutdown(wait=True, cancel_futures=True)
+    return successful
+
+def run_budgeted(model, user_profile, temperature, category_keys, budget, limit=None, run_id=None, run_info=None,
+                 use_catalog=False, max_repairs=0, steering=None, pipeline=False, workers=1):
+    """Generate suggestions until the budget (or limit, if given) runs out, and save them.
+    
+    Each next suggestion goes to the category with the fewest so far among
+    those the budget still projects to fit, so a balanced run shares what is
+    left across categories by their measured cost and keeps filling cheaper
+    categories once the expensive ones no longer fit. Requests never wait
+    past the deadline, and Ctrl+C stops the run after saving what is done.
+    Returns the number of suggestions saved.
+    """
+    steering = steering or {}
+    templates = {key: load_template(key) for key in category_keys}
+    attempts = {key: 0 for key in category_keys}
+    successful = 0
+    failures = 0
+    
+    try:
+        while limit is None or successful < limit:
+            by_progress = sorted(category_keys, key=lambda key: budget.completed.get(key, 0))
+            if pipeline:
+                # Batches of stubs to expand, shared out like single suggestions
+                category_key = next((key for key in by_progress if budget.fits(key)), None)
+                if category_key is None:
+                    break
+                plan = budget.capacity()
+                # Until a suggestion has finished there is nothing to project from, so start small
+                count = workers if plan is None else max(workers, min(PIPELINE_BATCH, plan[category_key]))
+                if limit is not None:
+                    count = min(count, limit - successful)
+                print(f"\n📂 Generating up to {count} {CATEGORIES[category_key]['name']}...")
+                saved = run_pipeline(model, user_profile, temperature, category_key, count, workers, run_id,
+                                     run_info, use_catalog, max_repairs, steering.get(category_key), budget,
+                                     attempts[category_key])
+                attempts[category_key] += count
+                successful += saved
+                failures = 0 if saved else failures + 1
+                if failures >= MAX_CONSECUTIVE_FAILURES:
+                    break
+                continue
+            
+            category_key = next((key for key in by_progress if budget.try_start(key)), None)
+            if category_key is None:
+                break
+            
+            index = attempts[category_key]
+            attempts[category_key] += 1
+            print(f"\n🧠 Generating {CATEGORIES[category_key]['name']} suggestion {index + 1}...")
+            
+            usage = {}
+            started = time.monotonic()
+            timeout = budget.request_timeout()
+            suggestion = generate_suggestion(model, user_profile, temperature, templates[category_key], category_key,
+                                             seed_offset=index, usage=usage, hints=steering.get(category_key),
+                                             timeout=timeout)
+            if suggestion and max_repairs:
+                suggestion, _ = repair_suggestion(model, temperature, suggestion, templates[category_key],
+                                                  category_key, max_repairs, usage=usage, timeout=timeout)
+            saved = bool(suggestion) and bool(save_suggestion(suggestion, index, category_key, run_id, run_info,
+                                                              use_catalog, usage=usage))
+            budget.finish(category_key, usage, time.monotonic() - started, saved)
+            successful += saved
+            print(f"⏱️ {budget.progress()}")
+            
+            failures = 0 if saved else failures + 1
+            if failures >= MAX_CONSECUTIVE_FAILURES:
+                break
+    except KeyboardInterrupt:
+        budget.stop_reason = "interrupted"
+        print("\n🛑 Interrupted, stopping the run")
+    
+    if budget.stop_reason is None:
+        budget.stop_reason = "errors" if failures >= MAX_CONSECUTIVE_FAILURES else "count reached"
+    return successful
+
+def load_steering_hints(category_key):
+    """Return prompt hints from the category's coverage map, or None if there is no map."""
+    category_folder = CATEGORIES[category_key]["folder"]
+    coverage = load_coverage_map(category_folder)
+    if coverage is None:
+        print(f"❌ No coverage map for {CATEGORIES[category_key]['name']}; "
+              f"run python scripts/corpus_coverage.py to build one")
         return None
+    hints = steering_hints(coverage)
+    if hints:
+        print(f"✅ Steering {CATEGORIES[category_key]['name']} with the coverage map "
+              f"({coverage['documents']} suggestions)")
+    return hints
+
+def record_ollama_timings(result):
+    """Record the server-side durations Ollama reports (in nanoseconds) with the profiler."""
+    for field, stage in (("load_duration", "ollama load"),
+                         ("prompt_eval_duration", "ollama prompt"),
+                         ("eval_duration", "ollama eval")):
+        if result.get(field):
+            PROFILER.record(stage, result[field] / 1e9)
 
 def extract_title(suggestion_text):
     """Extract a descriptive title from the generated suggestion.
@@ -364,19 +840,24 @@ def extract_title(suggestion_text):
     timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
     return f"suggestion-{timestamp}"
 
-def save_suggestion(suggestion_text, index, category_key):
-    """Save the suggestion to a markdown file in the appropriate category folder."""
-    # Create the main suggestions directory if it doesn't exist
-    if not os.path.exists(SUGGESTIONS_DIR):
-        os.makedirs(SUGGESTIONS_DIR)
+def save_suggestion(suggestion_text, index, category_key, run_id=None, run_info=None, use_catalog=False,
+                    output_dir=SUGGESTIONS_DIR, usage=None):
+    """Save the suggestion to a markdown file in the appropriate category folder.
     
-    # Create the category-specific folder if it doesn't exist
-    category_folder = os.path.join(SUGGESTIONS_DIR, CATEGORIES[category_key]["folder"])
-    if not os.path.exists(category_folder):
-        os.makedirs(category_folder)
+    When a run_id is given the file is recorded in that run's manifest
+    (with usage, the token counts and timings from generate_suggestion(), if
+    given), and with use_catalog it is also added to the suggestion catalog.
+    output_dir is the folder the category folders are created in; it must be
+    inside SUGGESTIONS_DIR.
+    Returns the path of the saved file, or None on failure.
+    """
+    # Create the category-specific folder (and its parents) if it doesn't exist
+    category_folder = os.path.join(output_dir, CATEGORIES[category_key]["folder"])
+    os.makedirs(category_folder, exist_ok=True)
     
     # Extract a title from the suggestion
-    title = extract_title(suggestion_text)
+    with PROFILER.span("title"):
+        title = extract_title(suggestion_text)
     
     # Add index to filename to avoid collisions
     timestamp = datetime.datetime.now().strftime("%Y%m%d")
@@ -385,20 +866,58 @@ def save_suggestion(suggestion_text, index, category_key):
     
     # Save the suggestion to a file
     try:
-        with open(filepath, 'w') as f:
+        with PROFILER.span("save"), open(filepath, 'w') as f:
             f.write(suggestion_text)
         print(f"✅ Saved suggestion to {filepath}")
-        return True
     except Exception as e:
         print(f"❌ Error saving suggestion: {e}")
-        return False
+        return None
+    
+    if run_id:
+        relative_path = os.path.relpath(filepath, SUGGESTIONS_DIR)
+        record = {
+            "event": "suggestion",
+            "file": relative_path,
+            "category": category_key,
+            "category_folder": CATEGORIES[category_key]["folder"]
+        }
+        if usage:
+            record["usage"] = usage
+        with PROFILER.span("manifest"):
+            append_run_record(SUGGESTIONS_DIR, run_id, record)
+        
+        if use_catalog:
+            with PROFILER.span("catalog"):
+                catalog_saved_suggestion(SUGGESTIONS_DIR, relative_path, suggestion_text, dict(run_info or {}, **record))
+    
+    return filepath
 
 def main():
     """Main function to run the ideation agent."""
     parser = argparse.ArgumentParser(description='Career Exploration Ideation Agent')
     parser.add_argument('--check-dependencies', action='store_true', 
                         help='Check if all required dependencies are installed')
+    parser.add_argument('--catalog', action='store_true',
+                        help='Add saved suggestions to the SQLite suggestion catalog')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Two-stage generation: brainstorm idea stubs, then expand the best ones in parallel')
+    parser.add_argument('--workers', type=int, default=2,
+                        help='Concurrent expansion requests in --pipeline mode (match OLLAMA_NUM_PARALLEL)')
+    parser.add_argument('--validate', action='store_true',
+                        help="Check each suggestion against its template and regenerate only missing or invalid sections")
+    parser.add_argument('--max-repairs', type=int, default=1,
+                        help='Follow-up repair calls per suggestion with --validate')
+    parser.add_argument('--steer', action='store_true',
+                        help='Add explore/avoid hints from the corpus coverage map (see corpus_coverage.py) to prompts')
+    parser.add_argument('--deadline', type=parse_duration,
+                        help='Wall-clock budget for the run, e.g. 2h, 90m or 1h30m; stops cleanly when it runs out')
+    parser.add_argument('--token-budget', type=parse_count,
+                        help='Token budget for the run (prompt + output tokens), e.g. 3M or 500k')
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    budgeted = bool(args.deadline or args.token_budget)
+    max_repairs = args.max_repairs if args.validate else 0
+    configure_profiler(args)
     
     # Check dependencies if requested
     if args.check_dependencies:
@@ -430,7 +949,45 @@ def main():
     print(f"✅ Loaded user profile for {user_profile['user']['name']}")
     
     # Get user parameters
-    category_key, num_suggestions, creativity, temperature, balanced_mode = get_user_parameters()
+    category_key, num_suggestions, creativity, temperature, balanced_mode = get_user_parameters(budgeted)
+    
+    # Record the run parameters so saved files can be traced back to them
+    run_id = new_run_id()
+    run_info = {"run_id": run_id, "model": model, "temperature": temperature, "creativity": creativity}
+    run_categories = CATEGORIES.keys() if balanced_mode else [category_key]
+    append_run_record(SUGGESTIONS_DIR, run_id, dict(run_info, event="start", balanced=balanced_mode,
+                                                    category=category_key, requested=num_suggestions,
+                                                    deadline_seconds=args.deadline, token_budget=args.token_budget,
+                                                    generation_options={key: load_generation_profile(key)
+                                                                        for key in run_categories}))
+    
+    # Coverage hints per category, from corpus_coverage.py
+    steering = {key: load_steering_hints(key) for key in run_categories} if args.steer else {}
+    
+    if budgeted:
+        limits = []
+        if args.deadline:
+            limits.append(format_duration(args.deadline))
+        if args.token_budget:
+            limits.append(f"{format_count(args.token_budget)} tokens")
+        what = "a balanced mix of suggestions" if balanced_mode else CATEGORIES[category_key]['name']
+        print(f"\nGenerating {'up to ' + str(num_suggestions) if num_suggestions else 'as many'} {what} "
+              f"as fit in {' / '.join(limits)} with creativity level {creativity} (temperature: {temperature:.1f})")
+        
+        budget = RunBudget(run_categories, args.deadline, args.token_budget,
+                           args.workers if args.pipeline else 1)
+        successful = run_budgeted(model, user_profile, temperature, list(run_categories), budget, num_suggestions,
+                                  run_id, run_info, args.catalog, max_repairs, steering, args.pipeline, args.workers)
+        summary = budget.summary()
+        
+        # Summary
+        print(f"\n✅ Generated {successful} suggestions in {format_duration(summary['elapsed_seconds'])} "
+              f"using {format_count(summary['tokens_used'])} tokens (stopped: {summary['stop_reason']})")
+        for key, count in summary["completed"].items():
+            print(f"- {CATEGORIES[key]['name']}: {count} suggestions")
+        print(f"📁 Suggestions saved to {SUGGESTIONS_DIR}/ in their respective category folders")
+        append_run_record(SUGGESTIONS_DIR, run_id, {"event": "end", "successful": successful, "budget": summary})
+        return
     
     if balanced_mode:
         # Calculate how many suggestions to generate for each category
@@ -452,17 +1009,29 @@ def main():
         # Generate and save suggestions for each category
         successful = 0
         for category_key, count in category_counts.items():
+            if count == 0:
+                continue
             print(f"\n📂 Generating {count} {CATEGORIES[category_key]['name']}...")
             
+            if args.pipeline:
+                successful += run_pipeline(model, user_profile, temperature, category_key, count, args.workers,
+                                           run_id, run_info, args.catalog, max_repairs, steering.get(category_key))
+                continue
+            
             # Load template for this category
             template = load_template(category_key)
             
             for i in range(count):
                 print(f"\n🧠 Generating {CATEGORIES[category_key]['name']} suggestion {i+1}/{count}...")
                 
-                suggestion = generate_suggestion(model, user_profile, temperature, template, category_key)
+                usage = {}
+                suggestion = generate_suggestion(model, user_profile, temperature, template, category_key,
+                                                 seed_offset=i, usage=usage, hints=steering.get(category_key))
+                if suggestion and max_repairs:
+                    suggestion, _ = repair_suggestion(model, temperature, suggestion, template, category_key, max_repairs,
+                                                      usage=usage)
                 if suggestion:
-                    if save_suggestion(suggestion, i, category_key):
+                    if save_suggestion(suggestion, i, category_key, run_id, run_info, args.catalog, usage=usage):
                         successful += 1
                     time.sleep(1)  # Small delay between generations
         
@@ -472,23 +1041,34 @@ def main():
     else:
         print(f"\nGenerating {num_suggestions} {CATEGORIES[category_key]['name']} with creativity level {creativity} (temperature: {temperature:.1f})")
         
-        # Load template for the selected category
-        template = load_template(category_key)
-        
         # Generate and save suggestions
         successful = 0
-        for i in range(num_suggestions):
-            print(f"\n🧠 Generating suggestion {i+1}/{num_suggestions}...")
+        if args.pipeline:
+            successful = run_pipeline(model, user_profile, temperature, category_key, num_suggestions, args.workers,
+                                      run_id, run_info, args.catalog, max_repairs, steering.get(category_key))
+        else:
+            # Load template for the selected category
+            template = load_template(category_key)
             
-            suggestion = generate_suggestion(model, user_profile, temperature, template, category_key)
-            if suggestion:
-                if save_suggestion(suggestion, i, category_key):
-                    successful += 1
-                time.sleep(1)  # Small delay between generations
+            for i in range(num_suggestions):
+                print(f"\n🧠 Generating suggestion {i+1}/{num_suggestions}...")
+                
+                usage = {}
+                suggestion = generate_suggestion(model, user_profile, temperature, template, category_key,
+                                                 seed_offset=i, usage=usage, hints=steering.get(category_key))
+                if suggestion and max_repairs:
+                    suggestion, _ = repair_suggestion(model, temperature, suggestion, template, category_key, max_repairs,
+                                                      usage=usage)
+                if suggestion:
+                    if save_suggestion(suggestion, i, category_key, run_id, run_info, args.catalog, usage=usage):
+                        successful += 1
+                    time.sleep(1)  # Small delay between generations
         
         # Summary
         print(f"\n✅ Successfully generated {successful}/{num_suggestions} {CATEGORIES[category_key]['name']}.")
         print(f"📁 Suggestions saved to {os.path.join(SUGGESTIONS_DIR, CATEGORIES[category_key]['folder'])}/")
+    
+    append_run_record(SUGGESTIONS_DIR, run_id, {"event": "end", "successful": successful})
 
 if __name__ == "__main__":
     main()
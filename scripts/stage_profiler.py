@@ -0,0 +1,175 @@
+"""
+Stage Profiler
+
+Lightweight stage timing for the agent and the viewer. Code marks its stages
+with `with PROFILER.span("render"):` and, when profiling is enabled with
+--profile, the time spent in each stage is recorded and a summary table is
+printed at exit. cProfile and tracemalloc dumps can be requested as well.
+
+When profiling is off, span() returns a shared no-op context manager, so the
+instrumentation costs one attribute check per stage. Stages may be recorded
+from several threads at once.
+
+cProfile only sees the thread that enabled it, so every thread started after
+profiling is enabled gets a profiler of its own, and their stats are merged
+into the one dump. Threads that were already running are not covered.
+"""
+
+import sys
+import time
+import atexit
+import threading
+import contextlib
+
+_NULL_SPAN = contextlib.nullcontext()
+
+class StageStats:
+    """Accumulated timings for one stage."""
+
+    __slots__ = ("count", "total", "min", "max", "_lock")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, elapsed):
+        with self._lock:
+            self.count += 1
+            self.total += elapsed
+            self.min = min(self.min, elapsed)
+            self.max = max(self.max, elapsed)
+
+class _Span:
+    """Context manager that records the time spent inside it."""
+
+    __slots__ = ("stats", "start")
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stats.add(time.perf_counter() - self.start)
+        return False
+
+class Profiler:
+    """Collects per-stage timings and optional cProfile/tracemalloc output."""
+
+    def __init__(self):
+        self.enabled = False
+        self.stages = {}
+        self._started = None
+        self._cprofile = None
+        self._thread_cprofiles = []
+        self._cprofile_path = None
+        self._tracemalloc_path = None
+        self._lock = threading.Lock()
+
+    def enable(self, cprofile_path=None, tracemalloc_path=None):
+        """Start recording. The summary (and any dumps) are written at exit."""
+        self.enabled = True
+        self._started = time.perf_counter()
+        if cprofile_path:
+            import cProfile
+            self._cprofile_path = cprofile_path
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+            threading.setprofile(self._profile_thread)
+        if tracemalloc_path:
+            import tracemalloc
+            self._tracemalloc_path = tracemalloc_path
+            tracemalloc.start()
+        atexit.register(self.finish)
+
+    def _profile_thread(self, frame, event, arg):
+        """threading.setprofile() hook: start a cProfile profiler in each new thread."""
+        import cProfile
+        profile = cProfile.Profile()
+        with self._lock:
+            self._thread_cprofiles.append(profile)
+        # Replaces this hook for the rest of the thread
+        profile.enable()
+
+    def _stats(self, name):
+        stats = self.stages.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self.stages.setdefault(name, StageStats())
+        return stats
+
+    def span(self, name):
+        """Return a context manager timing the named stage."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self._stats(name))
+
+    def record(self, name, elapsed):
+        """Record a stage duration measured elsewhere (e.g. reported by a server)."""
+        if self.enabled:
+            self._stats(name).add(elapsed)
+
+    def finish(self):
+        """Stop recording, write the dumps and print the summary table."""
+        if not self.enabled:
+            return
+        self.enabled = False
+
+        if self._cprofile is not None:
+            import pstats
+            self._cprofile.disable()
+            threading.setprofile(None)
+            stats = pstats.Stats(self._cprofile)
+            with self._lock:
+                for profile in self._thread_cprofiles:
+                    stats.add(profile)
+            stats.dump_stats(self._cprofile_path)
+            print(f"📈 cProfile stats written to {self._cprofile_path} (view with: python -m pstats {self._cprofile_path})")
+
+        if self._tracemalloc_path:
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            snapshot.dump(self._tracemalloc_path)
+            print(f"📈 tracemalloc snapshot written to {self._tracemalloc_path} "
+                  f"(current {current / 1024 / 1024:.1f} MiB, peak {peak / 1024 / 1024:.1f} MiB)")
+
+        self.print_summary()
+
+    def print_summary(self, file=None):
+        """Print the stage timing table."""
+        file = file or sys.stdout
+        wall = time.perf_counter() - self._started if self._started else 0.0
+        print("\n⏱  Stage timings", file=file)
+        if not self.stages:
+            print("  (no stages recorded)", file=file)
+            return
+        print(f"  {'stage':<16}{'calls':>8}{'total s':>11}{'mean ms':>11}{'min ms':>11}{'max ms':>11}{'% wall':>9}", file=file)
+        for name, stats in sorted(self.stages.items(), key=lambda item: item[1].total, reverse=True):
+            mean = stats.total / stats.count
+            share = 100 * stats.total / wall if wall else 0.0
+            print(f"  {name:<16}{stats.count:>8}{stats.total:>11.3f}{mean * 1000:>11.2f}"
+                  f"{stats.min * 1000:>11.2f}{stats.max * 1000:>11.2f}{share:>8.1f}%", file=file)
+        print(f"  {'wall clock':<16}{'':>8}{wall:>11.3f}", file=file)
+
+PROFILER = Profiler()
+
+def add_profile_arguments(parser):
+    """Add the --profile options to an argument parser."""
+    parser.add_argument('--profile', action='store_true',
+                        help='Record per-stage timings and print a summary at exit')
+    parser.add_argument('--profile-cprofile', metavar='PATH',
+                        help='With --profile, also write cProfile stats to PATH')
+    parser.add_argument('--profile-memory', metavar='PATH',
+                        help='With --profile, also write a tracemalloc snapshot to PATH')
+
+def configure_profiler(args):
+    """Enable the profiler if the parsed arguments ask for it."""
+    if args.profile or args.profile_cprofile or args.profile_memory:
+        PROFILER.enable(args.profile_cprofile, args.profile_memory)
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Suggestion Archives
+
+Packs the suggestions of finished runs into one archive file per run, so a
+large suggestions tree doesn't consist of tens of thousands of small files
+that are slow to scan, back up and sync.
+
+An archive (<suggestions dir>/.archives/<run_id>.pack) holds the markdown of
+every suggestion of the run back to back, followed by a JSON index with each
+suggestion's original relative path, byte offset, length and modification
+time, and a fixed-size footer that points at the index:
+
+    MAGIC | content 1 | content 2 | ... | index JSON | footer
+
+Archives are read through mmap: opening one reads only the footer and the
+index, and any suggestion can then be sliced out by its offset. Suggestions
+keep their original relative paths, so run manifests, the catalog and
+export state stay valid after packing. The viewer, server, export, catalog
+and coverage tools read archived suggestions alongside loose files, at the
+cost of one open per run.
+
+Usage:
+    python scripts/suggestion_archive.py pack                    # every finished run
+    python scripts/suggestion_archive.py pack --older-than 30    # finished over 30 days ago
+    python scripts/suggestion_archive.py pack --run 20250325-101500-123456
+    python scripts/suggestion_archive.py list
+    python scripts/suggestion_archive.py cat side_hustles/20250325-01-dataset-curation.md
+    python scripts/suggestion_archive.py unpack 20250325-101500-123456
+"""
+
+import os
+import sys
+import mmap
+import json
+import time
+import struct
+import argparse
+
+from suggestion_metadata import list_run_manifests, read_run_manifest
+
+# Constants
+SUGGESTIONS_DIR = "example-suggestions"
+ARCHIVES_DIR_NAME = ".archives"
+ARCHIVE_EXTENSION = ".pack"
+MAGIC = b"SUGGPACK1\n"
+# index offset, index length, footer magic
+FOOTER = struct.Struct("<QQ8s")
+FOOTER_MAGIC = b"SUGGIDX1"
+# Generated files that live next to a suggestion and go away when it is packed
+DERIVED_EXTENSIONS = (".html", ".html.gz", ".html.br")
+
+class ArchiveError(Exception):
+    """Raised when an archive file is missing or malformed."""
+
+class SuggestionArchive:
+    """Read-only access to one run archive through mmap."""
+
+    def __init__(self, path):
+        self.path = path
+        self.run_id = os.path.basename(path)[:-len(ARCHIVE_EXTENSION)]
+        with open(path, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise ArchiveError(f"{path} is empty") from e
+        try:
+            if self._map[:len(MAGIC)] != MAGIC or len(self._map) < len(MAGIC) + FOOTER.size:
+                raise ArchiveError(f"{path} is not a suggestion archive")
+            index_offset, index_length, footer_magic = FOOTER.unpack(self._map[-FOOTER.size:])
+            if footer_magic != FOOTER_MAGIC:
+                raise ArchiveError(f"{path} has no index (incomplete write?)")
+            index = json.loads(self._map[index_offset:index_offset + index_length])
+        except (ArchiveError, ValueError):
+            self._map.close()
+            raise
+        self.run_info = index["run"]
+        self.entries = index["entries"]
+
+    def read_bytes(self, entry):
+        """Return the raw bytes of one archived suggestion."""
+        return self._map[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def read(self, entry):
+        """Return the markdown of one archived suggestion."""
+        return self.read_bytes(entry).decode("utf-8", errors="replace")
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+def archives_dir(suggestions_dir=SUGGESTIONS_DIR):
+    """Return the directory holding the run archives."""
+    return os.path.join(suggestions_dir, ARCHIVES_DIR_NAME)
+
+def archive_path(suggestions_dir, run_id):
+    """Return the archive file of a run."""
+    return os.path.join(archives_dir(suggestions_dir), run_id + ARCHIVE_EXTENSION)
+
+def list_archives(suggestions_dir=SUGGESTIONS_DIR):
+    """List (run_id, archive path) for every run archive, oldest first."""
+    directory = archives_dir(suggestions_dir)
+    if not os.path.isdir(directory):
+        return []
+    return [
+        (name[:-len(ARCHIVE_EXTENSION)], os.path.join(directory, name))
+        for name in sorted(os.listdir(directory))
+        if name.endswith(ARCHIVE_EXTENSION)
+    ]
+
+def iter_archive_entries(suggestions_dir=SUGGESTIONS_DIR):
+    """Yield (archive, entry) for every archived suggestion, opening each archive once.
+
+    An archive is only open while its own entries are being yielded, so
+    read its content before advancing past them.
+    """
+    for _, path in list_archives(suggestions_dir):
+        try:
+            archive = SuggestionArchive(path)
+        except (OSError, ArchiveError) as e:
+            print(f"❌ Error opening archive {path}: {e}")
+            continue
+        with archive:
+            for entry in archive.entries:
+                yield archive, entry
+
+def iter_archived_suggestions(suggestions_dir=SUGGESTIONS_DIR, skip=None):
+    """Yield (relative path, content, mtime) for every archived suggestion.
+
+    Paths in skip (a set) are passed over without reading their content.
+    """
+    for archive, entry in iter_archive_entries(suggestions_dir):
+        if skip is None or entry["path"] not in skip:
+            yield entry["path"], archive.read(entry), entry["mtime"]
+
+class ArchiveIndex:
+    """Random access to archived suggestions by their original relative path."""
+
+    def __init__(self, suggestions_dir=SUGGESTIONS_DIR):
+        self.suggestions_dir = suggestions_dir
+        self.archives = {}
+        self._entries = {}
+        for run_id, path in list_archives(suggestions_dir):
+            try:
+                archive = SuggestionArchive(path)
+            except (OSError, ArchiveError) as e:
+                print(f"❌ Error opening archive {path}: {e}")
+                continue
+            self.archives[run_id] = archive
+            for position, entry in enumerate(archive.entries):
+                self._entries[entry["path"]] = (archive, entry, position)
+
+    def __contains__(self, relative_path):
+        return relative_path in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, relative_path):
+        """Return (archive, entry, position within the run) or None."""
+        return self._entries.get(relative_path.replace(os.sep, "/"))
+
+    def read(self, relative_path):
+        """Return the markdown of an archived suggestion, or None if it is not archived."""
+        found = self.lookup(relative_path)
+        return found[0].read(found[1]) if found else None
+
+    def close(self):
+        for archive in self.archives.values():
+            archive.close()
+        self.archives = {}
+        self._entries = {}
+
+def write_archive(path, run_info, items):
+    """Write an archive from (relative path, content bytes, mtime, mtime_ns) items.
+
+    The archive is written to a temporary file and moved into place, so a
+    reader never sees a half-written archive.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = path + ".tmp"
+    entries = []
+    with open(temporary_path, 'wb') as f:
+        f.write(MAGIC)
+        offset = len(MAGIC)
+        for relative_path, content, mtime, mtime_ns in items:
+            f.write(content)
+            entries.append({"path": relative_path.replace(os.sep, "/"), "offset": offset, "length": len(content),
+                            "mtime": mtime, "mtime_ns": mtime_ns})
+            offset += len(content)
+        index = json.dumps({"run": run_info, "entries": entries}, separators=(",", ":")).encode("utf-8")
+        f.write(index)
+        f.write(FOOTER.pack(offset, len(index), FOOTER_MAGIC))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary_path, path)
+    return entries
+
+def remove_loose_suggestion(suggestions_dir, relative_path):
+    """Delete a packed suggestion's markdown, its generated pages and any folders left empty."""
+    base = os.path.splitext(os.path.join(suggestions_dir, relative_path))[0]
+    for path in [base + ".md"] + [base + extension for extension in DERIVED_EXTENSIONS]:
+        if os.path.exists(path):
+            os.remove(path)
+    # Remove emptied job/sweep output folders, but keep the top-level category folders
+    directory = os.path.dirname(base)
+    while os.path.dirname(os.path.relpath(directory, suggestions_dir)) and not os.listdir(directory):
+        os.rmdir(directory)
+        directory = os.path.dirname(directory)
+
+def pack_run(suggestions_dir, run_id, manifest_path):
+    """Pack one finished run into its archive. Returns the number of suggestions packed."""
+    run_info, records, ended = read_run_manifest(manifest_path)
+    if not ended:
+        return 0
+
+    items = []
+    for record in records:
+        file_path = os.path.join(suggestions_dir, record["file"])
+        try:
+            with open(file_path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                items.append((record["file"], f.read(), stat.st_mtime, stat.st_mtime_ns))
+        except OSError:
+            # Already packed, moved or deleted
+            continue
+    if not items:
+        return 0
+
+    path = archive_path(suggestions_dir, run_id)
+    if os.path.exists(path):
+        # A run that gained files after packing (e.g. unpacked and regenerated): keep what is archived
+        with SuggestionArchive(path) as archive:
+            packed = {entry["path"] for entry in archive.entries}
+            items = [(entry["path"], archive.read_bytes(entry), entry["mtime"], entry["mtime_ns"])
+                     for entry in archive.entries] + [item for item in items if item[0] not in packed]
+    write_archive(path, run_info, items)
+    for item in items:
+        remove_loose_suggestion(suggestions_dir, item[0])
+    return len(items)
+
+def pack_runs(suggestions_dir=SUGGESTIONS_DIR, run_ids=None, older_than_days=None):
+    """Pack finished runs. Returns (runs packed, suggestions packed)."""
+    cutoff = time.time() - older_than_days * 86400 if older_than_days is not None else None
+    runs = suggestions = 0
+    for run_id, manifest_path in list_run_manifests(suggestions_dir):
+        if run_ids and run_id not in run_ids:
+            continue
+        # The manifest is last written when the run ends
+        if cutoff is not None and os.path.getmtime(manifest_path) > cutoff:
+            continue
+        count = pack_run(suggestions_dir, run_id, manifest_path)
+        if count:
+            runs += 1
+            suggestions += count
+            print(f"📦 Packed {count} suggestion(s) from run {run_id}")
+    return runs, suggestions
+
+def unpack_run(suggestions_dir, run_id):
+    """Restore a run's suggestions as loose files and delete its archive. Returns the count."""
+    path = archive_path(suggestions_dir, run_id)
+    with SuggestionArchive(path) as archive:
+        for entry in archive.entries:
+            file_path = os.path.join(suggestions_dir, entry["path"])
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            # Restore the exact bytes that were packed, without decoding or newline translation
+            with open(file_path, 'wb') as f:
+                f.write(archive.read_bytes(entry))
+            os.utime(file_path, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+        count = len(archive.entries)
+    os.remove(path)
+    return count
+
+def main():
+    """Main function for the archive command line."""
+    parser = argparse.ArgumentParser(description="Suggestion Archives")
+    parser.add_argument("--suggestions-dir", default=SUGGESTIONS_DIR, help="Suggestions folder")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pack_parser = subparsers.add_parser("pack", help="Pack finished runs into archives")
+    pack_parser.add_argument("--run", action="append", help="Run id to pack (repeatable; default: all finished runs)")
+    pack_parser.add_argument("--older-than", type=float, metavar="DAYS", help="Only pack runs that ended DAYS ago or earlier")
+
+    unpack_parser = subparsers.add_parser("unpack", help="Restore a run's suggestions as loose files")
+    unpack_parser.add_argument("run_id")
+
+    subparsers.add_parser("list", help="List the run archives")
+
+    cat_parser = subparsers.add_parser("cat", help="Print an archived suggestion")
+    cat_parser.add_argument("path", help="Suggestion path relative to the suggestions folder")
+
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        runs, suggestions = pack_runs(args.suggestions_dir, args.run, args.older_than)
+        print(f"✅ Packed {suggestions} suggestion(s) from {runs} run(s) into {archives_dir(args.suggestions_dir)}/")
+    elif args.command == "unpack":
+        try:
+            count = unpack_run(args.suggestions_dir, args.run_id)
+        except (OSError, ArchiveError) as e:
+            print(f"❌ Error unpacking run {args.run_id}: {e}")
+            sys.exit(1)
+        print(f"✅ Restored {count} suggestion(s) from run {args.run_id}")
+    elif args.command == "list":
+        for run_id, path in list_archives(args.suggestions_dir):
+            try:
+                with SuggestionArchive(path) as archive:
+                    print(f"{run_id}  {len(archive.entries):>5} suggestion(s)  "
+                          f"{os.path.getsize(path) / 1024:.0f} KiB  model {archive.run_info.get('model')}")
+            except (OSError, ArchiveError) as e:
+                print(f"{run_id}  ❌ {e}")
+    elif args.command == "cat":
+        index = ArchiveIndex(args.suggestions_dir)
+        content = index.read(args.path)
+        index.close()
+        if content is None:
+            print(f"❌ {args.path} is not in any archive")
+            sys.exit(1)
+        print(content, end="")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Suggestion Catalog
+
+An optional SQLite catalog of every generated suggestion. Suggestion content
+is indexed in an FTS5 table for full-text search, and category, rating,
+model, temperature and run id are stored in indexed columns so questions
+about thousands of suggestions don't need a rescan of the markdown files.
+
+The ideation agent updates the catalog as it saves suggestions (--catalog),
+and the catalog can be rebuilt from the files on disk at any time.
+
+Usage:
+    python scripts/suggestion_catalog.py rebuild
+    python scripts/suggestion_catalog.py search "dataset curation"
+    python scripts/suggestion_catalog.py top --category side_hustles --limit 5
+    python scripts/suggestion_catalog.py run 20250325-101500-123456
+"""
+
+import os
+import sys
+import sqlite3
+import argparse
+import datetime
+
+from suggestion_metadata import parse_suggestion, load_run_index
+from suggestion_archive import iter_archive_entries
+
+# Constants
+SUGGESTIONS_DIR = "example-suggestions"
+CATALOG_PATH = os.path.join(SUGGESTIONS_DIR, "catalog.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS suggestions (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    title TEXT,
+    category TEXT,
+    rating REAL,
+    model TEXT,
+    temperature REAL,
+    run_id TEXT,
+    created_at TEXT,
+    mtime REAL
+);
+CREATE INDEX IF NOT EXISTS idx_suggestions_category_rating ON suggestions (category, rating);
+CREATE INDEX IF NOT EXISTS idx_suggestions_rating ON suggestions (rating);
+CREATE INDEX IF NOT EXISTS idx_suggestions_model ON suggestions (model);
+CREATE INDEX IF NOT EXISTS idx_suggestions_temperature ON suggestions (temperature);
+CREATE INDEX IF NOT EXISTS idx_suggestions_run_id ON suggestions (run_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS suggestions_fts USING fts5 (title, content);
+"""
+
+def open_catalog(catalog_path=CATALOG_PATH):
+    """Open (and create if needed) the catalog database."""
+    os.makedirs(os.path.dirname(catalog_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(catalog_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def category_from_path(relative_path):
+    """Return the category folder a suggestion was saved in."""
+    parts = relative_path.replace(os.sep, "/").split("/")
+    return parts[-2] if len(parts) > 1 else None
+
+def index_suggestion(conn, relative_path, content, run_info=None, mtime=None):
+    """Insert or update one suggestion in the catalog.
+
+    relative_path is relative to the suggestions directory. run_info holds the
+    run parameters (run_id, model, temperature, category) where known.
+    """
+    run_info = run_info or {}
+    parsed = parse_suggestion(content)
+    created_at = datetime.datetime.fromtimestamp(mtime) if mtime else datetime.datetime.now()
+
+    row = conn.execute("SELECT id FROM suggestions WHERE path = ?", (relative_path,)).fetchone()
+    values = (
+        parsed["title"],
+        run_info.get("category_folder") or category_from_path(relative_path),
+        parsed["rating"],
+        run_info.get("model"),
+        run_info.get("temperature"),
+        run_info.get("run_id"),
+        created_at.strftime("%Y-%m-%d %H:%M:%S"),
+        mtime
+    )
+    if row:
+        suggestion_id = row["id"]
+        conn.execute(
+            """UPDATE suggestions SET title = ?, category = ?, rating = ?, model = ?, temperature = ?,
+               run_id = ?, created_at = ?, mtime = ? WHERE id = ?""",
+            values + (suggestion_id,)
+        )
+        conn.execute("DELETE FROM suggestions_fts WHERE rowid = ?", (suggestion_id,))
+    else:
+        cursor = conn.execute(
+            """INSERT INTO suggestions (title, category, rating, model, temperature, run_id, created_at, mtime, path)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            values + (relative_path,)
+        )
+        suggestion_id = cursor.lastrowid
+    conn.execute(
+        "INSERT INTO suggestions_fts (rowid, title, content) VALUES (?, ?, ?)",
+        (suggestion_id, parsed["title"], content)
+    )
+    return suggestion_id
+
+def remove_suggestion(conn, relative_path):
+    """Remove one suggestion from the catalog."""
+    row = conn.execute("SELECT id FROM suggestions WHERE path = ?", (relative_path,)).fetchone()
+    if row:
+        conn.execute("DELETE FROM suggestions_fts WHERE rowid = ?", (row["id"],))
+        conn.execute("DELETE FROM suggestions WHERE id = ?", (row["id"],))
+
+def catalog_saved_suggestion(suggestions_dir, relative_path, content, run_info, catalog_path=CATALOG_PATH):
+    """Add a freshly saved suggestion to the catalog. Used by the agent at save time."""
+    try:
+        conn = open_catalog(catalog_path)
+        with conn:
+            mtime = os.path.getmtime(os.path.join(suggestions_dir, relative_path))
+            index_suggestion(conn, relative_path, content, run_info, mtime)
+        conn.close()
+        return True
+    except sqlite3.Error as e:
+        print(f"❌ Error updating suggestion catalog: {e}")
+        return False
+
+def iter_suggestion_files(suggestions_dir):
+    """Yield (relative path, absolute path) for every suggestion markdown file."""
+    for dirpath, dirnames, filenames in os.walk(suggestions_dir):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        for filename in filenames:
+            if filename.endswith('.md'):
+                file_path = os.path.join(dirpath, filename)
+                yield os.path.relpath(file_path, suggestions_dir), file_path
+
+def rebuild_catalog(suggestions_dir=SUGGESTIONS_DIR, catalog_path=CATALOG_PATH):
+    """Bring the catalog in line with the files on disk and the run archives.
+
+    Files whose modification time is unchanged are skipped, so repeated
+    rebuilds only pay for what changed. Returns (indexed, removed) counts.
+    """
+    conn = open_catalog(catalog_path)
+    run_index = load_run_index(suggestions_dir)
+    known = {row["path"]: row["mtime"] for row in conn.execute("SELECT path, mtime FROM suggestions")}
+
+    indexed = 0
+    seen = set()
+    with conn:
+        for relative_path, file_path in iter_suggestion_files(suggestions_dir):
+            seen.add(relative_path)
+            mtime = os.path.getmtime(file_path)
+            if known.get(relative_path) == mtime:
+                continue
+            try:
+                with open(file_path, 'r') as f:
+                    content = f.read()
+            except OSError as e:
+                print(f"Error reading {file_path}: {e}")
+                continue
+            index_suggestion(conn, relative_path, content, run_index.get(relative_path), mtime)
+            indexed += 1
+
+        # Suggestions packed into run archives keep their paths and modification times
+        for archive, entry in iter_archive_entries(suggestions_dir):
+            relative_path = entry["path"]
+            if relative_path in seen:
+                continue
+            seen.add(relative_path)
+            if known.get(relative_path) == entry["mtime"]:
+                continue
+            index_suggestion(conn, relative_path, archive.read(entry), run_index.get(relative_path), entry["mtime"])
+            indexed += 1
+
+        removed = 0
+        for relative_path in set(known) - seen:
+            remove_suggestion(conn, relative_path)
+            removed += 1
+    conn.close()
+    return indexed, removed
+
+def search(conn, query, limit=20, category=None):
+    """Full-text search over suggestion titles and content, best matches first."""
+    sql = """SELECT s.path, s.title, s.category, s.rating, s.run_id,
+                    snippet(suggestions_fts, 1, '[', ']', '…', 12) AS snippet
+             FROM suggestions_fts JOIN suggestions s ON s.id = suggestions_fts.rowid
+             WHERE suggestions_fts MATCH ?"""
+    params = [query]
+    if category:
+        sql += " AND s.category = ?"
+        params.append(category)
+    sql += " ORDER BY bm25(suggestions_fts) LIMIT ?"
+    params.append(limit)
+    return conn.execute(sql, params).fetchall()
+
+def top_rated(conn, category=None, limit=10):
+    """Return the highest rated suggestions, per category unless one is given."""
+    if category:
+        return conn.execute(
+            """SELECT path, title, category, rating, run_id FROM suggestions
+               WHERE category = ? AND rating IS NOT NULL ORDER BY rating DESC LIMIT ?""",
+            (category, limit)
+        ).fetchall()
+    return conn.execute(
+        """SELECT path, title, category, rating, run_id FROM (
+               SELECT *, ROW_NUMBER() OVER (PARTITION BY category ORDER BY rating DESC) AS position
+               FROM suggestions WHERE rating IS NOT NULL
+           ) WHERE position <= ? ORDER BY category, rating DESC""",
+        (limit,)
+    ).fetchall()
+
+def suggestions_for_run(conn, run_id, min_rating=None):
+    """Return the suggestions generated by one run."""
+    sql = "SELECT path, title, category, rating, model, temperature FROM suggestions WHERE run_id = ?"
+    params = [run_id]
+    if min_rating is not None:
+        sql += " AND rating >= ?"
+        params.append(min_rating)
+    return conn.execute(sql + " ORDER BY path", params).fetchall()
+
+def format_rating(rating):
+    """Format a rating for display."""
+    return f"{rating:g}/10" if rating is not None else "  -  "
+
+def main():
+    """Main function for the catalog command line."""
+    parser = argparse.ArgumentParser(description="Suggestion Catalog")
+    parser.add_argument("--catalog", default=CATALOG_PATH, help="Path to the catalog database")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("rebuild", help="Rebuild the catalog from the suggestion files")
+
+    search_parser = subparsers.add_parser("search", help="Full-text search over suggestions")
+    search_parser.add_argument("query", help="FTS5 query, e.g. 'dataset AND curation'")
+    search_parser.add_argument("--category", help="Limit results to one category folder")
+    search_parser.add_argument("--limit", type=int, default=20)
+
+    top_parser = subparsers.add_parser("top", help="Top-rated suggestions per category")
+    top_parser.add_argument("--category", help="Only show this category folder")
+    top_parser.add_argument("--limit", type=int, default=5)
+
+    run_parser = subparsers.add_parser("run", help="List the suggestions from one run")
+    run_parser.add_argument("run_id")
+    run_parser.add_argument("--min-rating", type=float)
+
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        indexed, removed = rebuild_catalog(SUGGESTIONS_DIR, args.catalog)
+        print(f"✅ Catalog updated: {indexed} indexed, {removed} removed")
+        return
+
+    conn = open_catalog(args.catalog)
+    try:
+        if args.command == "search":
+            rows = search(conn, args.query, args.limit, args.category)
+            for row in rows:
+                print(f"{format_rating(row['rating'])}  {row['title']}  ({row['path']})")
+                print(f"        {row['snippet']}")
+        elif args.command == "top":
+            rows = top_rated(conn, args.category, args.limit)
+            current_category = None
+            for row in rows:
+                if row["category"] != current_category:
+                    current_category = row["category"]
+                    print(f"\n📂 {current_category}")
+                print(f"  {format_rating(row['rating'])}  {row['title']}  ({row['path']})")
+        elif args.command == "run":
+            rows = suggestions_for_run(conn, args.run_id, args.min_rating)
+            for row in rows:
+                print(f"{format_rating(row['rating'])}  {row['title']}  ({row['path']})")
+    except sqlite3.OperationalError as e:
+        print(f"❌ Catalog query failed: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    if not rows:
+        print("No matching suggestions.")
+
+if __name__ == "__main__":
+    main()
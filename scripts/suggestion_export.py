@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Suggestion Export
+
+Exports the suggestion corpus as data: one row per suggestion with its
+title, category, summary, rating, sections, the parameters of the run that
+generated it (model, temperature, creativity) and the generation timings and
+token counts recorded in the run manifest.
+
+The export streams: suggestions are read, parsed and converted one at a time
+by a chain of generators and written in fixed-size batches. Exports are
+incremental. <output>.state.json keeps a cursor, the modification time and
+path of the last suggestion exported, and later exports only append
+suggestions past it (use --full to start over), so neither the state nor
+memory use grows with the corpus; only the keys of the new suggestions and
+the manifests of the runs that wrote them are held while exporting.
+Suggestions packed into run archives keep their original modification time
+and are exported the same way. Files changed within the last SETTLE_SECONDS
+are left for the next export, so one still being written isn't skipped.
+
+Formats:
+- jsonl: one JSON object per line, appended to the output file
+- csv: appended to the output file; sections are a JSON-encoded column
+- parquet: the output is a directory and every export adds a part file;
+  needs the optional pyarrow package
+
+Usage:
+    python scripts/suggestion_export.py exports/suggestions.jsonl
+    python scripts/suggestion_export.py exports/suggestions.csv
+    python scripts/suggestion_export.py exports/suggestions.parquet --format parquet
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from suggestion_metadata import parse_suggestion, load_run_index
+from suggestion_catalog import category_from_path, iter_suggestion_files
+from suggestion_archive import SuggestionArchive, ArchiveError, archive_path, list_archives
+
+# Constants
+SUGGESTIONS_DIR = "example-suggestions"
+BATCH_SIZE = 1000
+SETTLE_SECONDS = 1
+FORMATS = ("jsonl", "csv", "parquet")
+
+FIELDS = [
+    "path", "category", "title", "summary", "rating", "sections",
+    "run_id", "model", "temperature", "creativity",
+    "prompt_tokens", "output_tokens", "load_seconds", "prompt_seconds", "eval_seconds", "total_seconds",
+    "created_at"
+]
+
+def state_path(output_path):
+    """Return the file that records what has been exported to output_path."""
+    return output_path.rstrip("/" + os.sep) + ".state.json"
+
+def load_export_state(output_path):
+    """Return the cursor of the last export to output_path: (mtime_ns, path), or None."""
+    try:
+        with open(state_path(output_path), 'r') as f:
+            mtime_ns, relative_path = json.load(f)["cursor"]
+        return int(mtime_ns), relative_path
+    except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+
+def save_export_state(output_path, cursor, export_format):
+    """Record the cursor of the last suggestion exported to output_path."""
+    with open(state_path(output_path), 'w') as f:
+        json.dump({"format": export_format, "updated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                   "cursor": list(cursor)}, f)
+
+def new_suggestion_keys(suggestions_dir, cursor, cutoff_ns):
+    """List (mtime_ns, relative path, file path, run id) for suggestions past the cursor, oldest first.
+
+    Loose suggestions have a file path, archived ones the run id of their
+    archive. Only suggestions modified by cutoff_ns are listed.
+    """
+    def is_new(mtime_ns, relative_path):
+        return mtime_ns <= cutoff_ns and (cursor is None or (mtime_ns, relative_path) > cursor)
+
+    keys = []
+    for relative_path, file_path in iter_suggestion_files(suggestions_dir):
+        try:
+            mtime_ns = os.stat(file_path).st_mtime_ns
+        except OSError as e:
+            print(f"❌ Error reading {file_path}: {e}")
+            continue
+        if is_new(mtime_ns, relative_path):
+            keys.append((mtime_ns, relative_path, file_path, None))
+    for run_id, path in list_archives(suggestions_dir):
+        try:
+            with SuggestionArchive(path) as archive:
+                keys.extend((entry["mtime_ns"], entry["path"], None, run_id)
+                            for entry in archive.entries if is_new(entry["mtime_ns"], entry["path"]))
+        except (OSError, ArchiveError) as e:
+            print(f"❌ Error opening archive {path}: {e}")
+    keys.sort(key=lambda key: key[:2])
+    # A run being packed can briefly have the same suggestion loose and archived
+    return [key for i, key in enumerate(keys) if i == 0 or key[:2] != keys[i - 1][:2]]
+
+def iter_new_suggestions(suggestions_dir, keys):
+    """Yield (relative path, content, mtime, cursor) for the listed suggestions, in order."""
+    archives = {}
+    try:
+        for mtime_ns, relative_path, file_path, run_id in keys:
+            try:
+                if file_path is not None:
+                    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                        content = f.read()
+                else:
+                    if run_id not in archives:
+                        archive = SuggestionArchive(archive_path(suggestions_dir, run_id))
+                        archives[run_id] = (archive, {entry["path"]: entry for entry in archive.entries})
+                    archive, entries = archives[run_id]
+                    content = archive.read(entries[relative_path])
+            except (OSError, ArchiveError, KeyError) as e:
+                print(f"❌ Error reading {relative_path}: {e}")
+                continue
+            yield relative_path, content, mtime_ns / 1e9, (mtime_ns, relative_path)
+    finally:
+        for archive, _ in archives.values():
+            archive.close()
+
+def iter_records(suggestions, run_index):
+    """Parse (relative path, content, mtime, cursor) suggestions into (cursor, export row) pairs."""
+    for relative_path, content, mtime, cursor in suggestions:
+        parsed = parse_suggestion(content)
+        run = run_index.get(relative_path, {})
+        usage = run.get("usage") or {}
+        yield (cursor, {
+            "path": relative_path,
+            "category": run.get("category_folder") or category_from_path(relative_path),
+            "title": parsed["title"],
+            "summary": parsed["summary"],
+            "rating": parsed["rating"],
+            "sections": parsed["sections"],
+            "run_id": run.get("run_id"),
+            "model": run.get("model"),
+            "temperature": run.get("temperature"),
+            "creativity": run.get("creativity"),
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "output_tokens": usage.get("output_tokens"),
+            "load_seconds": usage.get("load_seconds"),
+            "prompt_seconds": usage.get("prompt_seconds"),
+            "eval_seconds": usage.get("eval_seconds"),
+            "total_seconds": usage.get("total_seconds"),
+            "created_at": datetime.datetime.fromtimestamp(mtime).isoformat(timespec="seconds")
+        })
+
+def batched(rows, size=BATCH_SIZE):
+    """Group rows into lists of at most size rows."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+class JsonlWriter:
+    """Appends rows to a JSON Lines file."""
+
+    def __init__(self, output_path):
+        self._file = open(output_path, 'a', encoding='utf-8')
+
+    def write_batch(self, rows):
+        self._file.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class CsvWriter:
+    """Appends rows to a CSV file, writing the header when the file is new."""
+
+    def __init__(self, output_path):
+        new_file = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        self._file = open(output_path, 'a', encoding='utf-8', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=FIELDS)
+        if new_file:
+            self._writer.writeheader()
+
+    def write_batch(self, rows):
+        self._writer.writerows(dict(row, sections=json.dumps(row["sections"], ensure_ascii=False)) for row in rows)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class ParquetWriter:
+    """Writes each export as a new part file in a Parquet dataset directory, one row group per batch."""
+
+    def __init__(self, output_path):
+        os.makedirs(output_path, exist_ok=True)
+        self.schema = pa.schema([
+            ("path", pa.string()), ("category", pa.string()), ("title", pa.string()), ("summary", pa.string()),
+            ("rating", pa.float64()), ("sections", pa.map_(pa.string(), pa.string())),
+            ("run_id", pa.string()), ("model", pa.string()), ("temperature", pa.float64()),
+            ("creativity", pa.int64()), ("prompt_tokens", pa.int64()), ("output_tokens", pa.int64()),
+            ("load_seconds", pa.float64()), ("prompt_seconds", pa.float64()), ("eval_seconds", pa.float64()),
+            ("total_seconds", pa.float64()), ("created_at", pa.string())
+        ])
+        part_name = f"part-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.parquet"
+        self._writer = pq.ParquetWriter(os.path.join(output_path, part_name), self.schema)
+
+    def write_batch(self, rows):
+        columns = {name: [row[name] for row in rows] for name in FIELDS}
+        columns["sections"] = [list(sections.items()) for sections in columns["sections"]]
+        self._writer.write_table(pa.table(columns, schema=self.schema))
+
+    def close(self):
+        self._writer.close()
+
+WRITERS = {"jsonl": JsonlWriter, "csv": CsvWriter, "parquet": ParquetWriter}
+
+def remove_output(output_path):
+    """Delete a previous export (file or Parquet directory) for a full re-export."""
+    if os.path.isdir(output_path):
+        for name in os.listdir(output_path):
+            if name.endswith(".parquet"):
+                os.remove(os.path.join(output_path, name))
+    elif os.path.exists(output_path):
+        os.remove(output_path)
+    if os.path.exists(state_path(output_path)):
+        os.remove(state_path(output_path))
+
+def export_suggestions(output_path, export_format, suggestions_dir=SUGGESTIONS_DIR):
+    """Append every suggestion not exported yet to output_path. Returns the number exported."""
+    cursor = load_export_state(output_path)
+    cutoff_ns = time.time_ns() - SETTLE_SECONDS * 1_000_000_000
+    keys = new_suggestion_keys(suggestions_dir, cursor, cutoff_ns)
+    if not keys:
+        return 0
+    run_index = load_run_index(suggestions_dir, modified_after_ns=cursor[0] if cursor else None)
+    rows = iter_records(iter_new_suggestions(suggestions_dir, keys), run_index)
+
+    writer = None
+    count = 0
+    try:
+        for batch in batched(rows):
+            # Only create the writer (and a Parquet part file) once there is something to write
+            if writer is None:
+                writer = WRITERS[export_format](output_path)
+            writer.write_batch([row for _, row in batch])
+            count += len(batch)
+            # The state is only the cursor, so advancing it after every batch is cheap
+            save_export_state(output_path, batch[-1][0], export_format)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+def main():
+    """Main function to export the suggestions."""
+    parser = argparse.ArgumentParser(description="Suggestion Export")
+    parser.add_argument("output", help="Output file (or directory, for Parquet)")
+    parser.add_argument("--format", choices=FORMATS, help="Output format (default: from the output's extension)")
+    parser.add_argument("--full", action="store_true", help="Discard the previous export and export everything")
+    parser.add_argument("--suggestions-dir", default=SUGGESTIONS_DIR, help="Suggestions folder to export")
+    args = parser.parse_args()
+
+    export_format = args.format or os.path.splitext(args.output.rstrip("/" + os.sep))[1].lstrip(".")
+    if export_format not in FORMATS:
+        print(f"❌ Unknown export format '{export_format}'; use --format with one of: {', '.join(FORMATS)}")
+        sys.exit(1)
+    if export_format == "parquet" and pa is None:
+        print("❌ Parquet export needs pyarrow: pip install pyarrow")
+        sys.exit(1)
+
+    if args.full:
+        remove_output(args.output)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+
+    count = export_suggestions(args.output, export_format, args.suggestions_dir)
+    if count:
+        print(f"✅ Exported {count} new suggestion(s) to {args.output}")
+    else:
+        print(f"✅ {args.output} is up to date")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Suggestion Metadata Helpers
+
+Shared helpers for reading generated suggestions: parsing the title, summary,
+rating and sections out of a suggestion's markdown, and reading/writing the
+run manifests the ideation agent keeps next to its output.
+
+Run manifests are JSON Lines files in <suggestions dir>/.runs/<run_id>.jsonl.
+The first record of a run has "event": "start" and holds the run parameters
+(model, temperature, creativity). Each saved suggestion appends a record with
+"event": "suggestion" and the file path relative to the suggestions directory.
+A finished run appends "event": "end".
+"""
+
+import os
+import re
+import json
+import datetime
+
+RUNS_DIR_NAME = ".runs"
+
+# Headings that carry the 1-10 rating in each category's response template
+RATING_HEADING_PATTERN = r'(?:Side-Hustle-Ometer|[^\n]*Score)'
+# The first section of every response template, used as the summary
+SUMMARY_FALLBACK_SECTION = "Recommendation Analysis"
+
+def parse_suggestion(content):
+    """Parse a suggestion's markdown into its title, summary, rating and sections."""
+    # Templates use a level-1 heading for the suggestion name; older files
+    # only have level-2 headings, so fall back to the first of those
+    title_match = re.search(r'^#\s+([^\n]+)', content, re.MULTILINE)
+    if not title_match:
+        title_match = re.search(r'##\s+([^\n]+)', content)
+    title = title_match.group(1).strip() if title_match else "Untitled Suggestion"
+
+    # Use the summary section if there is one; the response templates have
+    # none, so fall back to the opening paragraph of their first section
+    sections = parse_sections(content)
+    summary_match = re.search(r'##\s+Summary\s*\n+(.+?)(?=\n##|\Z)', content, re.DOTALL)
+    if summary_match:
+        summary = summary_match.group(1).strip()
+    else:
+        summary = first_paragraph(sections.get(SUMMARY_FALLBACK_SECTION) or next(iter(sections.values()), ""))
+    summary = summary or "No summary available."
+
+    # Extract the rating if it exists
+    rating_match = re.search(r'##\s+' + RATING_HEADING_PATTERN + r'\s*\n+(.+?)(?=\n##|\Z)', content, re.DOTALL)
+    rating_text = rating_match.group(1).strip() if rating_match else ""
+    rating = None
+    if rating_text:
+        rating_number_match = re.search(r'(\d+(?:\.\d+)?)\s*\/\s*10', rating_text)
+        if rating_number_match:
+            try:
+                rating = float(rating_number_match.group(1))
+            except ValueError:
+                pass
+
+    return {
+        "title": title,
+        "summary": summary,
+        "rating": rating,
+        "sections": sections
+    }
+
+def first_paragraph(text):
+    """Return the first paragraph of markdown text that is not a heading."""
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = paragraph.strip()
+        if paragraph and not paragraph.startswith("#"):
+            return paragraph
+    return ""
+
+def parse_sections(content):
+    """Split markdown into a {heading: body} dict of its level-2 sections."""
+    sections = {}
+    for match in re.finditer(r'^##\s+([^\n]+)\n(.*?)(?=^##\s|\Z)', content, re.MULTILINE | re.DOTALL):
+        sections[match.group(1).strip()] = match.group(2).strip()
+    return sections
+
+def file_number(file_path):
+    """Return the numeric prefix of a suggestion file name, or 0."""
+    number_match = re.match(r'(\d+)-', os.path.basename(file_path))
+    return int(number_match.group(1)) if number_match else 0
+
+def runs_dir(suggestions_dir):
+    """Return the directory holding the run manifests."""
+    return os.path.join(suggestions_dir, RUNS_DIR_NAME)
+
+def new_run_id():
+    """Create an identifier for a generation run."""
+    return datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+
+def append_run_record(suggestions_dir, run_id, record):
+    """Append one record to a run's manifest."""
+    os.makedirs(runs_dir(suggestions_dir), exist_ok=True)
+    record = dict(record, run_id=run_id, recorded_at=datetime.datetime.now().isoformat(timespec="seconds"))
+    with open(os.path.join(runs_dir(suggestions_dir), f"{run_id}.jsonl"), 'a') as f:
+        f.write(json.dumps(record) + "\n")
+
+def read_run_manifest(manifest_path):
+    """Read a run manifest.
+
+    Returns (run parameters, list of suggestion records, whether the run ended).
+    """
+    run_info = {}
+    suggestions = []
+    ended = False
+    with open(manifest_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A run that was killed mid-write can leave a partial line
+                continue
+            event = record.get("event")
+            if event == "start":
+                run_info = record
+            elif event == "suggestion":
+                suggestions.append(record)
+            elif event == "end":
+                ended = True
+    return run_info, suggestions, ended
+
+def list_run_manifests(suggestions_dir):
+    """List (run_id, manifest path) for every run manifest, oldest first."""
+    directory = runs_dir(suggestions_dir)
+    if not os.path.isdir(directory):
+        return []
+    return [
+        (name[:-len(".jsonl")], os.path.join(directory, name))
+        for name in sorted(os.listdir(directory))
+        if name.endswith(".jsonl")
+    ]
+
+def load_run_index(suggestions_dir, modified_after_ns=None):
+    """Map each suggestion file (relative path) to its run parameters.
+
+    With modified_after_ns, only manifests written to after that time are
+    read; a suggestion saved later than it is always in one of those, since
+    its record is appended once the file is written.
+    """
+    index = {}
+    for run_id, manifest_path in list_run_manifests(suggestions_dir):
+        if modified_after_ns is not None:
+            try:
+                if os.stat(manifest_path).st_mtime_ns <= modified_after_ns:
+                    continue
+            except OSError:
+                continue
+        run_info, suggestions, _ = read_run_manifest(manifest_path)
+        for record in suggestions:
+            entry = {
+                "run_id": run_id,
+                "model": run_info.get("model"),
+                "temperature": run_info.get("temperature"),
+                "creativity": run_info.get("creativity")
+            }
+            entry.update({k: v for k, v in record.items() if k not in ("event", "recorded_at")})
+            index[record["file"]] = entry
+    return index
@@ -0,0 +1,303 @@
+"""
+Suggestion Viewer Server
+
+Local HTTP server used by `suggestion_viewer.py --serve`. Instead of writing
+an .html file next to every suggestion up front, pages are rendered when they
+are requested and kept in an LRU cache keyed by a hash of the markdown, so a
+page is available as soon as the server starts regardless of corpus size.
+
+The index page and its card shards are served from in-memory metadata that a
+background thread collects while the server is already answering requests.
+Responses carry ETags and are gzip-compressed when the client accepts it.
+Suggestions packed into run archives are served from the archives, through
+one page per run.
+"""
+
+import os
+import time
+import gzip
+import hashlib
+import threading
+import mimetypes
+import collections
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import suggestion_viewer as viewer
+from suggestion_archive import ArchiveIndex
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_CACHE_SIZE = 256
+GZIP_MIN_BYTES = 1024
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+class LRUCache:
+    """A small thread-safe least-recently-used cache."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+class Response:
+    """A rendered response body with its ETag and lazily gzipped variant."""
+
+    def __init__(self, body, content_type, cache_control="no-cache"):
+        self.body = body.encode("utf-8") if isinstance(body, str) else body
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest() + '"'
+        self._gzipped = None
+
+    def gzipped(self):
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6)
+        return self._gzipped
+
+class SuggestionStore:
+    """In-memory suggestion metadata plus the rendered index data built from it."""
+
+    def __init__(self, suggestions_dir, cache_size=DEFAULT_CACHE_SIZE):
+        self.suggestions_dir = suggestions_dir
+        self.pages = LRUCache(cache_size)
+        self._metadata = {}
+        self._lock = threading.Lock()
+        self._version = 0
+        self._index_cache = (None, {})
+        self.archives = None
+        self.scan_complete = False
+        # Asset and shard names are content-hashed, so browsers may cache them forever
+        self.assets = {
+            file_name: Response(content, mimetypes.guess_type(name)[0] or "application/octet-stream", IMMUTABLE)
+            for name, (file_name, content) in viewer.asset_files().items()
+        }
+        self.index_page = Response(viewer.render_index_page(), "text/html; charset=utf-8")
+
+    def scan(self):
+        """Collect metadata for every suggestion file. Runs in a background thread."""
+        for file_path in viewer.find_suggestion_files():
+            self.update(file_path)
+        
+        archives = ArchiveIndex(self.suggestions_dir)
+        archived = {}
+        for run_id, archive in archives.archives.items():
+            for position, entry in enumerate(archive.entries):
+                metadata = viewer.archived_metadata(run_id, position, entry, archive.read(entry))
+                archived[metadata["file_path"]] = metadata
+        with self._lock:
+            self.archives = archives
+            for file_path, metadata in archived.items():
+                self._metadata.setdefault(file_path, metadata)
+            self._version += 1
+        self.scan_complete = True
+
+    def update(self, file_path):
+        """Refresh the metadata for one suggestion file."""
+        metadata = viewer.extract_metadata(file_path)
+        with self._lock:
+            self._metadata[metadata["file_path"]] = metadata
+            self._version += 1
+
+    def remove(self, file_path):
+        """Forget a suggestion file that was deleted, or switch to its archived copy if it was packed."""
+        relative_path = os.path.relpath(file_path, self.suggestions_dir)
+        with self._lock:
+            found = self.archives.lookup(relative_path) if self.archives else None
+        archived = viewer.archived_metadata(found[0].run_id, found[2], found[1], found[0].read(found[1])) \
+            if found else None
+        with self._lock:
+            if archived:
+                self._metadata[relative_path] = archived
+                self._version += 1
+            elif self._metadata.pop(relative_path, None):
+                self._version += 1
+
+    def reload_archives(self):
+        """Reopen the run archives, to pick up runs packed since the scan."""
+        archives = ArchiveIndex(self.suggestions_dir)
+        with self._lock:
+            # Pages being rendered may still read the old archives; they close once unreferenced
+            self.archives = archives
+
+    def index_data(self):
+        """Return {relative path: Response} for the manifest and card shards."""
+        with self._lock:
+            version, cached = self._index_cache
+            if version == self._version:
+                return cached
+            current_version = self._version
+            suggestions = list(self._metadata.values())
+
+        suggestions.sort(key=lambda x: x["creation_date"], reverse=True)
+        shards = viewer.build_card_shards(suggestions)
+        data = {path: Response(content, "text/javascript; charset=utf-8", IMMUTABLE) for path, content in shards}
+        data["data/manifest.js"] = Response(
+            viewer.build_manifest_script([path for path, _ in shards], len(suggestions)),
+            "text/javascript; charset=utf-8"
+        )
+        with self._lock:
+            self._index_cache = (current_version, data)
+        return data
+
+    def suggestion_page(self, relative_html_path):
+        """Render the page for a suggestion, using the cache when its content is unchanged."""
+        relative_md_path = os.path.splitext(relative_html_path)[0] + ".md"
+        try:
+            with open(os.path.join(self.suggestions_dir, relative_md_path), 'rb') as f:
+                raw = f.read()
+        except OSError:
+            # Links to suggestions that have since been packed still work
+            content = self.archives.read(relative_md_path) if self.archives else None
+            if content is None:
+                return None
+            raw = content.encode("utf-8")
+
+        key = hashlib.sha1(raw).hexdigest() + ":" + relative_html_path
+        response = self.pages.get(key)
+        if response is None:
+            html_path = os.path.join(self.suggestions_dir, relative_html_path)
+            html = viewer.render_suggestion_page(raw.decode("utf-8", errors="replace"), viewer.page_root(html_path))
+            response = Response(html, "text/html; charset=utf-8")
+            self.pages.put(key, response)
+        return response
+
+    def run_page(self, relative_html_path):
+        """Render the page of an archived run."""
+        archive = self.archives.archives.get(os.path.basename(relative_html_path)[:-len(".html")]) \
+            if self.archives else None
+        if archive is None:
+            return None
+        # Re-packing a run only ever adds entries
+        key = f"run:{relative_html_path}:{len(archive.entries)}"
+        response = self.pages.get(key)
+        if response is None:
+            html_path = os.path.join(self.suggestions_dir, relative_html_path)
+            html = viewer.render_run_page([archive.read(entry) for entry in archive.entries],
+                                          viewer.page_root(html_path))
+            response = Response(html, "text/html; charset=utf-8")
+            self.pages.put(key, response)
+        return response
+
+    def resolve(self, url_path):
+        """Map a request path to a Response, or None if there is nothing there."""
+        path = urllib.parse.unquote(urllib.parse.urlsplit(url_path).path).lstrip("/")
+        path = os.path.normpath(path).replace(os.sep, "/") if path else "index.html"
+        if path.startswith("..") or os.path.isabs(path):
+            return None
+
+        if path in ("index.html", "."):
+            return self.index_page
+        if path.startswith("assets/"):
+            return self.assets.get(path[len("assets/"):])
+        if path.startswith("data/"):
+            return self.index_data().get(path)
+        if path.startswith("archived/") and path.endswith(".html"):
+            return self.run_page(path)
+        if path.endswith(".html"):
+            return self.suggestion_page(path)
+        return None
+
+def make_handler(store):
+    """Create a request handler class bound to a suggestion store."""
+
+    class SuggestionRequestHandler(BaseHTTPRequestHandler):
+        server_version = "SuggestionViewer/1.0"
+
+        def do_GET(self):
+            self._respond(include_body=True)
+
+        def do_HEAD(self):
+            self._respond(include_body=False)
+
+        def _respond(self, include_body):
+            response = store.resolve(self.path)
+            if response is None:
+                self.send_error(404, "Suggestion not found")
+                return
+
+            if self.headers.get("If-None-Match") == response.etag:
+                self.send_response(304)
+                self.send_header("ETag", response.etag)
+                self.end_headers()
+                return
+
+            body = response.body
+            use_gzip = "gzip" in self.headers.get("Accept-Encoding", "") and len(body) >= GZIP_MIN_BYTES
+            if use_gzip:
+                body = response.gzipped()
+
+            self.send_response(200)
+            self.send_header("Content-Type", response.content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", response.etag)
+            self.send_header("Cache-Control", response.cache_control)
+            self.send_header("Vary", "Accept-Encoding")
+            if use_gzip:
+                self.send_header("Content-Encoding", "gzip")
+            self.end_headers()
+            if include_body:
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Keep the console quiet; the viewer prints its own status lines
+            pass
+
+    return SuggestionRequestHandler
+
+def watch_store(store):
+    """Keep a store's metadata in step with the files on disk."""
+    from suggestion_watcher import watch
+
+    def on_changes(changed, removed):
+        for file_path in changed:
+            store.update(file_path)
+        if removed:
+            # Removed files may have been packed into a run archive
+            store.reload_archives()
+        for file_path in removed:
+            store.remove(file_path)
+        print(f"🔄 {len(changed)} suggestion(s) updated, {len(removed)} removed")
+
+    # Start after the initial scan so the watcher's baseline matches it
+    while not store.scan_complete:
+        time.sleep(0.1)
+    watch(store.suggestions_dir, on_changes, viewer.SKIP_DIRS)
+
+def serve(suggestions_dir, host=DEFAULT_HOST, port=DEFAULT_PORT, cache_size=DEFAULT_CACHE_SIZE,
+          on_ready=None, watch=False):
+    """Start the viewer server and block until interrupted.
+
+    on_ready, if given, is called with the server URL once it is listening.
+    With watch, new and changed suggestion files show up in the index live.
+    """
+    store = SuggestionStore(suggestions_dir, cache_size)
+    threading.Thread(target=store.scan, name="suggestion-scan", daemon=True).start()
+    if watch:
+        threading.Thread(target=watch_store, args=(store,), name="suggestion-watch", daemon=True).start()
+
+    httpd = ThreadingHTTPServer((host, port), make_handler(store))
+    url = f"http://{host}:{httpd.server_address[1]}/"
+    print(f"✅ Serving suggestions at {url} (Ctrl+C to stop)")
+    if on_ready:
+        on_ready(url)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping suggestion server.")
+    finally:
+        httpd.server_close()
@@ -8,61 +8,57 @@ and generates an index.html file with a clean interface for browsing suggestions
 """
 
 import os
-import re
+import gzip
+import hashlib
 import datetime
 import json
 import webbrowser
-from pathlib import Path
 import markdown
 import argparse
 
+from suggestion_metadata import parse_suggestion, file_number
+from suggestion_archive import SuggestionArchive, ArchiveError, ArchiveIndex, list_archives
+from stage_profiler import PROFILER, add_profile_arguments, configure_profiler
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 # Constants
 SUGGESTIONS_DIR = "example-suggestions"
 INDEX_FILE = os.path.join(SUGGESTIONS_DIR, "index.html")
 ASSETS_DIR = os.path.join(SUGGESTIONS_DIR, "assets")
+DATA_DIR = os.path.join(SUGGESTIONS_DIR, "data")
+CARDS_PER_SHARD = 1000
+SUMMARY_PREVIEW_CHARS = 400
+# Pages for archived runs (one per run, see suggestion_archive.py)
+ARCHIVED_PAGES_DIR = os.path.join(SUGGESTIONS_DIR, "archived")
+SKIP_DIRS = {"assets", "data", "archived"}
+BUILD_STATE_FILE = os.path.join(DATA_DIR, "build-state.json")
+# Outputs at least this large also get .gz (and .br, with brotli) variants
+COMPRESS_MIN_BYTES = 4096
 
 def extract_metadata(file_path):
     """Extract metadata from a suggestion markdown file."""
     try:
-        with open(file_path, 'r') as f:
+        with PROFILER.span("read"), open(file_path, 'r') as f:
             content = f.read()
             
-        # Extract the suggestion title (Side Hustle Name)
-        title_match = re.search(r'##\s+([^\n]+)', content)
-        title = title_match.group(1).strip() if title_match else "Untitled Suggestion"
-        
-        # Extract the summary section if it exists
-        summary_match = re.search(r'##\s+Summary\s*\n+(.+?)(?=\n##|\Z)', content, re.DOTALL)
-        summary = summary_match.group(1).strip() if summary_match else "No summary available."
-        
-        # Extract the rating if it exists
-        rating_match = re.search(r'##\s+Side-Hustle-Ometer\s*\n+(.+?)(?=\n##|\Z)', content, re.DOTALL)
-        rating_text = rating_match.group(1).strip() if rating_match else ""
-        rating = None
-        if rating_text:
-            rating_number_match = re.search(r'(\d+(?:\.\d+)?)\s*\/\s*10', rating_text)
-            if rating_number_match:
-                try:
-                    rating = float(rating_number_match.group(1))
-                except ValueError:
-                    pass
+        with PROFILER.span("extract"):
+            parsed = parse_suggestion(content)
         
         # Get file creation date
         file_stats = os.stat(file_path)
         creation_date = datetime.datetime.fromtimestamp(file_stats.st_ctime)
         
-        # Extract file number prefix (if any)
-        file_name = os.path.basename(file_path)
-        number_match = re.match(r'(\d+)-', file_name)
-        number = int(number_match.group(1)) if number_match else 0
-        
         return {
-            "title": title,
-            "summary": summary,
-            "rating": rating,
+            "title": parsed["title"],
+            "summary": parsed["summary"],
+            "rating": parsed["rating"],
             "creation_date": creation_date.strftime("%Y-%m-%d %H:%M:%S"),
             "file_path": os.path.relpath(file_path, SUGGESTIONS_DIR),
-            "number": number
+            "number": file_number(file_path)
         }
     except Exception as e:
         print(f"Error extracting metadata from {file_path}: {e}")
@@ -75,51 +71,221 @@ def extract_metadata(file_path):
             "number": 0
         }
 
-def create_suggestion_html(suggestion_path):
-    """Convert a markdown suggestion to HTML."""
+def archived_metadata(run_id, position, entry, content):
+    """Build the metadata for one suggestion stored in a run archive.
+    
+    Archived suggestions are shown on their run's page, so "page" points at
+    the suggestion's section there instead of a page of its own.
+    """
+    with PROFILER.span("extract"):
+        parsed = parse_suggestion(content)
+    return {
+        "title": parsed["title"],
+        "summary": parsed["summary"],
+        "rating": parsed["rating"],
+        "creation_date": datetime.datetime.fromtimestamp(entry["mtime"]).strftime("%Y-%m-%d %H:%M:%S"),
+        "file_path": entry["path"].replace("/", os.sep),
+        "number": file_number(entry["path"]),
+        "page": f"archived/{run_id}.html#s-{position + 1}"
+    }
+
+def compressed_variants(data):
+    """Return {extension: compressed bytes} for the precompressed variants of data."""
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(data)
+    return variants
+
+def write_if_changed(path, content):
+    """Write content to path unless the file already holds exactly that content.
+    
+    Large outputs also get precompressed .gz/.br files next to them, which are
+    only rewritten together with the file itself. Returns True if anything
+    was written.
+    """
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    
     try:
-        with open(suggestion_path, 'r') as f:
-            md_content = f.read()
-        
-        # Convert markdown to HTML
-        html_content = markdown.markdown(md_content)
-        
-        # Add some basic styling
-        styled_html = f"""
+        with open(path, 'rb') as f:
+            changed = f.read() != data
+    except FileNotFoundError:
+        changed = True
+    
+    if changed:
+        with open(path, 'wb') as f:
+            f.write(data)
+    
+    wrote_variant = False
+    if len(data) >= COMPRESS_MIN_BYTES:
+        variants = None
+        for extension in (".gz", ".br"):
+            if extension == ".br" and brotli is None:
+                continue
+            if changed or not os.path.exists(path + extension):
+                variants = variants or compressed_variants(data)
+                with open(path + extension, 'wb') as f:
+                    f.write(variants[extension])
+                wrote_variant = True
+    else:
+        for extension in (".gz", ".br"):
+            if os.path.exists(path + extension):
+                os.remove(path + extension)
+    
+    return changed or wrote_variant
+
+def content_hash(content, length=10):
+    """Return a short hash of content for use in fingerprinted file names."""
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    return hashlib.sha256(data).hexdigest()[:length]
+
+def fingerprinted_name(name, content):
+    """Insert a content hash into a file name: styles.css -> styles.<hash>.css."""
+    base, extension = os.path.splitext(name)
+    return f"{base}.{content_hash(content)}{extension}"
+
+_asset_files = None
+
+def asset_files():
+    """Return {logical asset name: (fingerprinted file name, content)}."""
+    global _asset_files
+    if _asset_files is None:
+        _asset_files = {
+            name: (fingerprinted_name(name, content), content)
+            for name, content in build_assets().items()
+        }
+    return _asset_files
+
+def asset_url(name, root=""):
+    """Return the URL of an asset's fingerprinted file, relative to root."""
+    return f"{root}assets/{asset_files()[name][0]}"
+
+def load_build_state():
+    """Load the state recorded by the previous static build."""
+    try:
+        with open(BUILD_STATE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def page_root(html_path):
+    """Return the relative prefix from a page's folder back to the suggestions root."""
+    root = os.path.relpath(SUGGESTIONS_DIR, os.path.dirname(html_path)).replace(os.sep, "/")
+    return "" if root == "." else root + "/"
+
+def render_suggestion_page(md_content, root=""):
+    """Render a suggestion's markdown as a full HTML page.
+    
+    root is the relative prefix from the page back to the suggestions root,
+    used for the index and asset links.
+    """
+    # Convert markdown to HTML
+    html_content = markdown.markdown(md_content)
+    return render_page(f"""<div class="suggestion-content">
+                    {html_content}
+                </div>""", root)
+
+def render_run_page(contents, root=""):
+    """Render every suggestion of an archived run on one page, each in its own section."""
+    sections = "\n".join(
+        f'<div class="suggestion-content" id="s-{position + 1}">\n{markdown.markdown(content)}\n</div>'
+        for position, content in enumerate(contents)
+    )
+    return render_page(sections, root)
+
+def render_page(body_html, root=""):
+    """Wrap rendered suggestion HTML in the page shell."""
+    # Add some basic styling
+    return f"""
         <!DOCTYPE html>
         <html lang="en">
         <head>
             <meta charset="UTF-8">
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
             <title>Side Hustle Suggestion</title>
-            <link rel="stylesheet" href="assets/styles.css">
+            <link rel="stylesheet" href="{asset_url('styles.css', root)}">
         </head>
         <body>
             <div class="container suggestion-detail">
-                <a href="index.html" class="back-link">← Back to all suggestions</a>
-                <div class="suggestion-content">
-                    {html_content}
-                </div>
+                <a href="{root}index.html" class="back-link">← Back to all suggestions</a>
+                {body_html}
             </div>
         </body>
         </html>
         """
+
+def create_suggestion_html(suggestion_path, force=False):
+    """Convert a markdown suggestion to HTML.
+    
+    Pages that are newer than their markdown are left alone unless force is
+    set (e.g. because the stylesheet they link to changed).
+    """
+    try:
+        # Suggestions live in category subfolders, so links back to the
+        # index and assets have to be relative to the page's own folder
+        html_path = os.path.splitext(suggestion_path)[0] + ".html"
+        
+        if not force and os.path.exists(html_path) \
+                and os.path.getmtime(html_path) >= os.path.getmtime(suggestion_path):
+            return os.path.relpath(html_path, SUGGESTIONS_DIR)
+        
+        with PROFILER.span("read"), open(suggestion_path, 'r') as f:
+            md_content = f.read()
+        
+        with PROFILER.span("render"):
+            styled_html = render_suggestion_page(md_content, page_root(html_path))
         
         # Save the HTML file
-        html_path = os.path.splitext(suggestion_path)[0] + ".html"
-        with open(html_path, 'w') as f:
-            f.write(styled_html)
+        with PROFILER.span("write"):
+            write_if_changed(html_path, styled_html)
         
         return os.path.relpath(html_path, SUGGESTIONS_DIR)
     except Exception as e:
         print(f"Error creating HTML for {suggestion_path}: {e}")
         return None
 
-def create_assets():
-    """Create CSS and other assets for the viewer."""
-    os.makedirs(ASSETS_DIR, exist_ok=True)
+def create_run_html(archive, force=False):
+    """Write the page for an archived run unless it is newer than the archive."""
+    html_path = os.path.join(ARCHIVED_PAGES_DIR, archive.run_id + ".html")
+    if not force and os.path.exists(html_path) and os.path.getmtime(html_path) >= os.path.getmtime(archive.path):
+        return
+    with PROFILER.span("render"):
+        html = render_run_page([archive.read(entry) for entry in archive.entries], page_root(html_path))
+    with PROFILER.span("write"):
+        os.makedirs(ARCHIVED_PAGES_DIR, exist_ok=True)
+        write_if_changed(html_path, html)
+
+def process_archived_suggestions(force=False):
+    """Collect metadata for archived suggestions and write one page per archived run.
     
-    # Create CSS file
+    Each archive is opened once, however many suggestions it holds.
+    """
+    suggestions = []
+    current_pages = set()
+    for run_id, path in list_archives(SUGGESTIONS_DIR):
+        try:
+            with PROFILER.span("read"), SuggestionArchive(path) as archive:
+                for position, entry in enumerate(archive.entries):
+                    suggestions.append(archived_metadata(run_id, position, entry, archive.read(entry)))
+                create_run_html(archive, force)
+        except (OSError, ArchiveError) as e:
+            print(f"Error reading archive {path}: {e}")
+            continue
+        page = run_id + ".html"
+        current_pages.update({page, page + ".gz", page + ".br"})
+    
+    # Remove pages of runs that were unpacked
+    if os.path.isdir(ARCHIVED_PAGES_DIR):
+        for name in os.listdir(ARCHIVED_PAGES_DIR):
+            if name not in current_pages:
+                os.remove(os.path.join(ARCHIVED_PAGES_DIR, name))
+    return suggestions
+
+def build_assets():
+    """Build the CSS and JavaScript assets for the viewer.
+    
+    Returns a dict of asset file name to content.
+    """
+    # CSS
     css_content = """
     * {
         box-sizing: border-box;
@@ -185,19 +351,23 @@ def create_assets():
     }
     
     .suggestion-list {
-        display: grid;
-        grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
-        gap: 20px;
+        position: relative;
         margin-top: 20px;
     }
     
+    .suggestion-count {
+        color: #7f8c8d;
+        font-size: 14px;
+    }
+    
     .suggestion-card {
+        position: absolute;
         border: 1px solid #eee;
         border-radius: 6px;
         padding: 20px;
         transition: transform 0.2s, box-shadow 0.2s;
         background-color: white;
-        height: 100%;
+        height: 260px;
         display: flex;
         flex-direction: column;
     }
@@ -296,149 +466,238 @@ def create_assets():
         .search-box {
             width: 100%;
         }
-        
-        .suggestion-list {
-            grid-template-columns: 1fr;
-        }
     }
     """
     
-    with open(os.path.join(ASSETS_DIR, "styles.css"), 'w') as f:
-        f.write(css_content)
-    
-    # Create JavaScript file
+    # JavaScript
     js_content = """
-    document.addEventListener('DOMContentLoaded', function() {
-        const searchBox = document.getElementById('search-box');
-        const suggestionCards = document.querySelectorAll('.suggestion-card');
-        const sortDateBtn = document.getElementById('sort-date');
-        const sortRatingBtn = document.getElementById('sort-rating');
-        const sortNumberBtn = document.getElementById('sort-number');
-        const suggestionList = document.querySelector('.suggestion-list');
+    // Card data is loaded from paged shards (data/cards-NNNN.js) into a plain
+    // array. Sorting and searching work on that array, and only the cards that
+    // are currently visible are rendered into the DOM.
+    (function() {
+        const CARD_WIDTH = 300;
+        const CARD_HEIGHT = 260;
+        const GAP = 20;
+        const OVERSCAN_ROWS = 2;
         
-        // Search functionality
-        searchBox.addEventListener('input', function() {
-            const searchTerm = this.value.toLowerCase();
-            
-            suggestionCards.forEach(card => {
-                const title = card.querySelector('.suggestion-title').textContent.toLowerCase();
-                const summary = card.querySelector('.suggestion-summary').textContent.toLowerCase();
-                
-                if (title.includes(searchTerm) || summary.includes(searchTerm)) {
-                    card.style.display = '';
-                } else {
-                    card.style.display = 'none';
-                }
-            });
-        });
+        const allSuggestions = [];
+        let visibleSuggestions = [];
+        let sortBy = 'date';
+        let searchTerm = '';
+        let renderedRange = null;
+        let frameRequested = false;
         
-        // Sorting functionality
-        function sortCards(sortBy) {
-            const cardsArray = Array.from(suggestionCards);
+        const sorters = {
+            date: (a, b) => (b.d > a.d ? 1 : b.d < a.d ? -1 : 0), // Newest first
+            rating: (a, b) => (b.r || 0) - (a.r || 0), // Highest first
+            number: (a, b) => (b.n || 0) - (a.n || 0) // Highest first
+        };
+        
+        function escapeHtml(text) {
+            return String(text).replace(/[&<>"']/g, c => ({
+                '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+            })[c]);
+        }
+        
+        function cardHtml(suggestion, top, left, width) {
+            const rating = suggestion.r ? `<span class="suggestion-rating">${suggestion.r}/10</span>` : '';
+            return `
+            <div class="suggestion-card" style="top:${top}px;left:${left}px;width:${width}px">
+                <div class="suggestion-title">${escapeHtml(suggestion.t)}</div>
+                <div class="suggestion-meta">
+                    ${rating}
+                    <span>${escapeHtml(suggestion.d)}</span>
+                </div>
+                <div class="suggestion-summary">${escapeHtml(suggestion.s)}</div>
+                <a href="${encodeURI(suggestion.h)}" class="suggestion-link">View Suggestion</a>
+            </div>`;
+        }
+        
+        function layout(list) {
+            const width = list.clientWidth;
+            const columns = Math.max(1, Math.floor((width + GAP) / (CARD_WIDTH + GAP)));
+            const cardWidth = (width - GAP * (columns - 1)) / columns;
+            return { columns, cardWidth, rowHeight: CARD_HEIGHT + GAP };
+        }
+        
+        function render(force) {
+            frameRequested = false;
+            const list = document.querySelector('.suggestion-list');
+            const count = document.getElementById('suggestion-count');
+            if (!list) return;
             
-            if (sortBy === 'date') {
-                cardsArray.sort((a, b) => {
-                    const dateA = new Date(a.dataset.date);
-                    const dateB = new Date(b.dataset.date);
-                    return dateB - dateA; // Newest first
-                });
-                
-                sortDateBtn.classList.add('active');
-                sortRatingBtn.classList.remove('active');
-                sortNumberBtn.classList.remove('active');
-            } 
-            else if (sortBy === 'rating') {
-                cardsArray.sort((a, b) => {
-                    const ratingA = parseFloat(a.dataset.rating || 0);
-                    const ratingB = parseFloat(b.dataset.rating || 0);
-                    return ratingB - ratingA; // Highest first
-                });
-                
-                sortDateBtn.classList.remove('active');
-                sortRatingBtn.classList.add('active');
-                sortNumberBtn.classList.remove('active');
-            }
-            else if (sortBy === 'number') {
-                cardsArray.sort((a, b) => {
-                    const numA = parseInt(a.dataset.number || 0);
-                    const numB = parseInt(b.dataset.number || 0);
-                    return numB - numA; // Highest first
-                });
-                
-                sortDateBtn.classList.remove('active');
-                sortRatingBtn.classList.remove('active');
-                sortNumberBtn.classList.add('active');
+            if (count) count.textContent = `${visibleSuggestions.length} of ${allSuggestions.length} suggestion(s)`;
+            
+            if (!visibleSuggestions.length) {
+                list.style.height = '';
+                list.innerHTML = allSuggestions.length
+                    ? '<div class="no-suggestions">No suggestions match your search.</div>'
+                    : '<div class="no-suggestions">No suggestions found. Generate some using the Side Hustle Ideation Agent!</div>';
+                renderedRange = null;
+                return;
             }
             
-            // Reappend in new order
-            cardsArray.forEach(card => {
-                suggestionList.appendChild(card);
+            const { columns, cardWidth, rowHeight } = layout(list);
+            const totalRows = Math.ceil(visibleSuggestions.length / columns);
+            list.style.height = `${totalRows * rowHeight - GAP}px`;
+            
+            // Work out which rows intersect the viewport
+            const listTop = list.getBoundingClientRect().top;
+            const firstRow = Math.max(0, Math.floor(-listTop / rowHeight) - OVERSCAN_ROWS);
+            const lastRow = Math.min(totalRows - 1,
+                Math.ceil((window.innerHeight - listTop) / rowHeight) + OVERSCAN_ROWS);
+            
+            const key = `${firstRow}:${lastRow}:${columns}:${cardWidth}`;
+            if (!force && renderedRange === key) return;
+            renderedRange = key;
+            
+            const html = [];
+            const end = Math.min(visibleSuggestions.length, (lastRow + 1) * columns);
+            for (let i = firstRow * columns; i < end; i++) {
+                const row = Math.floor(i / columns);
+                const column = i % columns;
+                html.push(cardHtml(visibleSuggestions[i], row * rowHeight, column * (cardWidth + GAP), cardWidth));
+            }
+            list.innerHTML = html.join('');
+        }
+        
+        function scheduleRender() {
+            if (frameRequested) return;
+            frameRequested = true;
+            window.requestAnimationFrame(() => render(false));
+        }
+        
+        function refresh() {
+            visibleSuggestions = searchTerm
+                ? allSuggestions.filter(s => s.t.toLowerCase().includes(searchTerm) || s.s.toLowerCase().includes(searchTerm))
+                : allSuggestions.slice();
+            visibleSuggestions.sort(sorters[sortBy]);
+            render(true);
+        }
+        
+        function setSort(newSortBy) {
+            sortBy = newSortBy;
+            ['date', 'rating', 'number'].forEach(key => {
+                const button = document.getElementById(`sort-${key}`);
+                if (button) button.classList.toggle('active', key === sortBy);
             });
+            refresh();
         }
         
-        // Add event listeners for sorting
-        if (sortDateBtn) sortDateBtn.addEventListener('click', () => sortCards('date'));
-        if (sortRatingBtn) sortRatingBtn.addEventListener('click', () => sortCards('rating'));
-        if (sortNumberBtn) sortNumberBtn.addEventListener('click', () => sortCards('number'));
+        function loadScript(src) {
+            return new Promise((resolve, reject) => {
+                const script = document.createElement('script');
+                script.src = src;
+                script.onload = resolve;
+                script.onerror = reject;
+                document.head.appendChild(script);
+            });
+        }
+        
+        // Called by each shard file as it loads
+        window.registerSuggestionShard = function(index, suggestions) {
+            for (const suggestion of suggestions) allSuggestions.push(suggestion);
+        };
         
-        // Initialize with date sort
-        if (sortDateBtn) sortDateBtn.click();
-    });
+        async function loadShards() {
+            const manifest = window.SUGGESTION_MANIFEST || { shards: [] };
+            for (const shard of manifest.shards) {
+                try {
+                    await loadScript(shard);
+                } catch (e) {
+                    console.error(`Failed to load ${shard}`, e);
+                }
+                refresh();
+            }
+            refresh();
+        }
+        
+        document.addEventListener('DOMContentLoaded', function() {
+            const searchBox = document.getElementById('search-box');
+            
+            // Search functionality
+            searchBox.addEventListener('input', function() {
+                searchTerm = this.value.toLowerCase();
+                refresh();
+            });
+            
+            // Add event listeners for sorting
+            ['date', 'rating', 'number'].forEach(key => {
+                const button = document.getElementById(`sort-${key}`);
+                if (button) button.addEventListener('click', () => setSort(key));
+            });
+            
+            window.addEventListener('scroll', scheduleRender, { passive: true });
+            window.addEventListener('resize', () => { renderedRange = null; scheduleRender(); });
+            
+            loadShards();
+        });
+    })();
     """
     
-    with open(os.path.join(ASSETS_DIR, "script.js"), 'w') as f:
-        f.write(js_content)
+    return {"styles.css": css_content, "script.js": js_content}
 
-def generate_index_html(suggestions):
-    """Generate the index.html file with all suggestions."""
-    # Create the suggestions directory if it doesn't exist
-    os.makedirs(SUGGESTIONS_DIR, exist_ok=True)
-    
-    # Create assets (CSS, JS)
-    create_assets()
-    
-    # Sort suggestions by creation date (newest first)
-    sorted_suggestions = sorted(
-        suggestions, 
-        key=lambda x: datetime.datetime.strptime(x["creation_date"], "%Y-%m-%d %H:%M:%S"), 
-        reverse=True
-    )
+def create_assets():
+    """Create CSS and other assets for the viewer under fingerprinted names."""
+    os.makedirs(ASSETS_DIR, exist_ok=True)
     
-    # Generate HTML for each suggestion card
-    suggestion_cards = ""
-    for suggestion in sorted_suggestions:
-        rating_html = ""
-        if suggestion["rating"]:
-            rating_html = f'<span class="suggestion-rating">{suggestion["rating"]}/10</span>'
-        
-        # Get HTML path
-        html_path = os.path.splitext(suggestion["file_path"])[0] + ".html"
-        
-        suggestion_cards += f"""
-        <div class="suggestion-card" data-date="{suggestion['creation_date']}" data-rating="{suggestion['rating'] or 0}" data-number="{suggestion['number']}">
-            <div class="suggestion-title">{suggestion['title']}</div>
-            <div class="suggestion-meta">
-                {rating_html}
-                <span>{suggestion['creation_date']}</span>
-            </div>
-            <div class="suggestion-summary">{suggestion['summary']}</div>
-            <a href="{html_path}" class="suggestion-link">View Suggestion</a>
-        </div>
-        """
+    current = set()
+    for file_name, content in asset_files().values():
+        write_if_changed(os.path.join(ASSETS_DIR, file_name), content)
+        current.update({file_name, file_name + ".gz", file_name + ".br"})
     
-    # If no suggestions, show a message
-    if not suggestion_cards:
-        suggestion_cards = '<div class="no-suggestions">No suggestions found. Generate some using the Side Hustle Ideation Agent!</div>'
+    # Remove assets from previous builds
+    for name in os.listdir(ASSETS_DIR):
+        if name not in current:
+            os.remove(os.path.join(ASSETS_DIR, name))
+
+def suggestion_card_record(suggestion):
+    """Build the compact record for one suggestion card in the index data."""
+    summary = suggestion["summary"]
+    if len(summary) > SUMMARY_PREVIEW_CHARS:
+        summary = summary[:SUMMARY_PREVIEW_CHARS].rstrip() + "…"
+    
+    return {
+        "t": suggestion["title"],
+        "s": summary,
+        "r": suggestion["rating"],
+        "d": suggestion["creation_date"],
+        "n": suggestion["number"],
+        "h": suggestion.get("page") or (os.path.splitext(suggestion["file_path"])[0] + ".html").replace(os.sep, "/")
+    }
+
+def js_payload(value):
+    """Serialize a value as JSON that is safe to embed in a script."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+
+def build_card_shards(suggestions):
+    """Split the card records into shard scripts.
     
-    # Create the HTML file
-    html_content = f"""
+    Returns a list of (relative path, script content) tuples.
+    """
+    shards = []
+    for start in range(0, len(suggestions), CARDS_PER_SHARD):
+        index = start // CARDS_PER_SHARD
+        records = [suggestion_card_record(s) for s in suggestions[start:start + CARDS_PER_SHARD]]
+        content = f"registerSuggestionShard({index},{js_payload(records)});\n"
+        # Shard names carry a content hash so unchanged shards stay cached
+        shards.append((f"data/{fingerprinted_name(f'cards-{index:04d}.js', content)}", content))
+    return shards
+
+def build_manifest_script(shard_paths, total):
+    """Build the script that tells the index page which shards to load."""
+    return f"window.SUGGESTION_MANIFEST={js_payload({'total': total, 'shards': shard_paths})};\n"
+
+def render_index_page():
+    """Render the index page shell. Card data is loaded from the shards."""
+    return f"""
     <!DOCTYPE html>
     <html lang="en">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Side Hustle Suggestions</title>
-        <link rel="stylesheet" href="assets/styles.css">
+        <link rel="stylesheet" href="{asset_url('styles.css')}">
     </head>
     <body>
         <div class="container">
@@ -453,22 +712,63 @@ def generate_index_html(suggestions):
                 </div>
             </div>
             
-            <div class="suggestion-list">
-                {suggestion_cards}
-            </div>
+            <div id="suggestion-count" class="suggestion-count"></div>
+            <div class="suggestion-list"></div>
         </div>
         
-        <script src="assets/script.js"></script>
+        <script src="data/manifest.js"></script>
+        <script src="{asset_url('script.js')}"></script>
     </body>
     </html>
     """
+
+def generate_index_html(suggestions):
+    """Generate the index.html file and the paged card data it loads."""
+    # Create the suggestions directory if it doesn't exist
+    os.makedirs(SUGGESTIONS_DIR, exist_ok=True)
+    os.makedirs(DATA_DIR, exist_ok=True)
+    
+    # Create assets (CSS, JS)
+    create_assets()
+    
+    # Sort suggestions by creation date (newest first)
+    sorted_suggestions = sorted(suggestions, key=lambda x: x["creation_date"], reverse=True)
+    
+    # Write the card data as shards so the page never holds more than the
+    # visible cards in its DOM
+    shards = build_card_shards(sorted_suggestions)
+    for shard_path, shard_content in shards:
+        write_if_changed(os.path.join(SUGGESTIONS_DIR, shard_path), shard_content)
+    
+    # Remove shards left over from previous builds
+    current = set()
+    for shard_path, _ in shards:
+        name = os.path.basename(shard_path)
+        current.update({name, name + ".gz", name + ".br"})
+    for name in os.listdir(DATA_DIR):
+        if name.startswith("cards-") and name not in current:
+            os.remove(os.path.join(DATA_DIR, name))
+    
+    write_if_changed(os.path.join(DATA_DIR, "manifest.js"),
+                     build_manifest_script([path for path, _ in shards], len(sorted_suggestions)))
     
     # Write the HTML file
-    with open(INDEX_FILE, 'w') as f:
-        f.write(html_content)
+    write_if_changed(INDEX_FILE, render_index_page())
     
     return INDEX_FILE
 
+def find_suggestion_files():
+    """Find all suggestion markdown files, including those in category folders."""
+    md_files = []
+    for dirpath, dirnames, filenames in os.walk(SUGGESTIONS_DIR):
+        if dirpath == SUGGESTIONS_DIR:
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        for filename in filenames:
+            if filename.endswith('.md'):
+                md_files.append(os.path.join(dirpath, filename))
+    return md_files
+
 def process_suggestions():
     """Process all suggestion files and generate HTML files."""
     if not os.path.exists(SUGGESTIONS_DIR):
@@ -476,48 +776,127 @@ def process_suggestions():
         return []
     
     suggestions = []
-    md_files = [f for f in os.listdir(SUGGESTIONS_DIR) if f.endswith('.md')]
     
-    for md_file in md_files:
-        file_path = os.path.join(SUGGESTIONS_DIR, md_file)
-        
+    # Pages only need re-rendering wholesale when the assets they link to changed
+    asset_names = {name: file_name for name, (file_name, _) in asset_files().items()}
+    force = load_build_state().get("assets") != asset_names
+    
+    with PROFILER.span("scan"):
+        md_files = find_suggestion_files()
+    
+    for file_path in md_files:
         # Extract metadata
         metadata = extract_metadata(file_path)
         suggestions.append(metadata)
         
         # Create HTML version
-        create_suggestion_html(file_path)
+        create_suggestion_html(file_path, force)
+    
+    suggestions.extend(process_archived_suggestions(force))
+    
+    os.makedirs(DATA_DIR, exist_ok=True)
+    write_if_changed(BUILD_STATE_FILE, json.dumps({"assets": asset_names}, indent=2))
     
     return suggestions
 
+def watch_suggestions(suggestions):
+    """Keep the generated viewer up to date as suggestion files change.
+    
+    Only the changed files are re-read and re-rendered; the index is rebuilt
+    from the metadata already held in memory. Removed files that were packed
+    into a run archive stay listed, from the archive.
+    """
+    from suggestion_watcher import watch
+    
+    metadata = {s["file_path"]: s for s in suggestions}
+    
+    def on_changes(changed, removed):
+        for file_path in changed:
+            suggestion = extract_metadata(file_path)
+            metadata[suggestion["file_path"]] = suggestion
+            create_suggestion_html(file_path)
+        
+        archives = ArchiveIndex(SUGGESTIONS_DIR) if removed else None
+        packed_runs = {}
+        for file_path in removed:
+            relative_path = os.path.relpath(file_path, SUGGESTIONS_DIR)
+            metadata.pop(relative_path, None)
+            html_path = os.path.splitext(file_path)[0] + ".html"
+            for path in (html_path, html_path + ".gz", html_path + ".br"):
+                if os.path.exists(path):
+                    os.remove(path)
+            found = archives.lookup(relative_path)
+            if found:
+                archive, entry, position = found
+                metadata[relative_path] = archived_metadata(archive.run_id, position, entry, archive.read(entry))
+                packed_runs[archive.run_id] = archive
+        for archive in packed_runs.values():
+            create_run_html(archive)
+        if archives is not None:
+            archives.close()
+        
+        with PROFILER.span("index"):
+            generate_index_html(list(metadata.values()))
+        print(f"🔄 {len(changed)} suggestion(s) updated, {len(removed)} removed ({len(metadata)} total)")
+    
+    print("👀 Watching for new suggestions (Ctrl+C to stop)...")
+    try:
+        watch(SUGGESTIONS_DIR, on_changes, SKIP_DIRS)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
 def main():
     """Main function to run the suggestion viewer."""
     parser = argparse.ArgumentParser(description="Side Hustle Suggestion Viewer")
     parser.add_argument("--no-browser", action="store_true", help="Don't open browser automatically")
+    parser.add_argument("--rebuild-catalog", action="store_true", help="Update the SQLite suggestion catalog from disk")
+    parser.add_argument("--serve", action="store_true", help="Serve suggestions from a local HTTP server, rendering pages on request")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind in --serve mode")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on in --serve mode")
+    parser.add_argument("--cache-size", type=int, default=256, help="Number of rendered pages to keep cached in --serve mode")
+    parser.add_argument("--watch", action="store_true", help="Keep running and update the viewer as suggestion files change")
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    configure_profiler(args)
     
     print("\n📊 Side Hustle Suggestion Viewer 📊\n")
     
+    if args.serve:
+        from suggestion_server import serve
+        open_browser = None if args.no_browser else webbrowser.open
+        serve(SUGGESTIONS_DIR, args.host, args.port, args.cache_size, on_ready=open_browser, watch=args.watch)
+        return
+    
     # Process suggestion files
     suggestions = process_suggestions()
     
-    if not suggestions:
+    if not suggestions and not args.watch:
         print("No suggestion files found in the 'suggestions' directory.")
         print("Generate some suggestions first using the Side Hustle Ideation Agent.")
         return
     
     # Generate the index HTML
-    index_file = generate_index_html(suggestions)
+    with PROFILER.span("index"):
+        index_file = generate_index_html(suggestions)
     
     print(f"✅ Generated suggestion viewer at {index_file}")
     print(f"Found {len(suggestions)} suggestion(s)")
     
+    if args.rebuild_catalog:
+        from suggestion_catalog import rebuild_catalog
+        indexed, removed = rebuild_catalog(SUGGESTIONS_DIR)
+        print(f"✅ Catalog updated: {indexed} indexed, {removed} removed")
+    
     # Open in browser if requested
     if not args.no_browser:
         index_url = f"file://{os.path.abspath(index_file)}"
         print(f"Opening {index_url} in your browser...")
         webbrowser.open(index_url)
     
+    if args.watch:
+        watch_suggestions(suggestions)
+        return
+    
     print("\nYou can view your suggestions anytime by running this script again.")
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+"""
+Suggestion Watcher
+
+Watches the suggestions tree for new, changed and deleted markdown files so
+the viewer can update while the agent is still generating. Uses inotify
+(through the optional inotify_simple package) on Linux and falls back to
+polling file modification times everywhere else.
+
+Bursts of writes are debounced: changes are collected until the tree has been
+quiet for a short while and then handed over as one batch.
+"""
+
+import os
+import time
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+DEFAULT_DEBOUNCE_SECONDS = 0.5
+DEFAULT_POLL_INTERVAL = 1.0
+# Flush a batch even if writes never pause, so a busy run still shows progress
+MAX_BATCH_DELAY_SECONDS = 5.0
+
+def is_suggestion_file(path):
+    """Return True if path is a suggestion markdown file."""
+    return path.endswith('.md')
+
+def walk_watched_dirs(root, skip_dirs):
+    """Yield every directory under root that may contain suggestions."""
+    for dirpath, dirnames, _ in os.walk(root):
+        if dirpath == root:
+            dirnames[:] = [d for d in dirnames if d not in skip_dirs]
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        yield dirpath
+
+class PollingWatcher:
+    """Detects changes by comparing file modification times between polls."""
+
+    def __init__(self, root, skip_dirs=(), interval=DEFAULT_POLL_INTERVAL):
+        self.root = root
+        self.skip_dirs = set(skip_dirs)
+        self.interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self):
+        snapshot = {}
+        for directory in walk_watched_dirs(self.root, self.skip_dirs):
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_file() and is_suggestion_file(entry.name):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, timeout):
+        """Wait one poll interval and return (changed paths, removed paths)."""
+        time.sleep(self.interval)
+        snapshot = self._take_snapshot()
+        changed = {path for path, signature in snapshot.items() if self._snapshot.get(path) != signature}
+        removed = set(self._snapshot) - set(snapshot)
+        self._snapshot = snapshot
+        return changed, removed
+
+class InotifyWatcher:
+    """Receives change events from the kernel through inotify."""
+
+    def __init__(self, root, skip_dirs=()):
+        self.root = root
+        self.skip_dirs = set(skip_dirs)
+        self._inotify = INotify()
+        self._mask = (inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO | inotify_flags.MOVED_FROM
+                      | inotify_flags.DELETE | inotify_flags.CREATE)
+        self._watches = {}
+        for directory in walk_watched_dirs(root, self.skip_dirs):
+            self._add_watch(directory)
+
+    def _add_watch(self, directory):
+        try:
+            self._watches[self._inotify.add_watch(directory, self._mask)] = directory
+        except OSError:
+            pass
+
+    def _watch_new_tree(self, directory, changed):
+        """Watch a new directory and everything under it, adding the files already there to changed.
+
+        A makedirs() call or a moved-in tree creates nested directories and
+        files before their watches exist, so no events arrive for those.
+        """
+        for subdirectory in walk_watched_dirs(directory, ()):
+            self._add_watch(subdirectory)
+            try:
+                entries = list(os.scandir(subdirectory))
+            except OSError:
+                continue
+            changed.update(entry.path for entry in entries if entry.is_file() and is_suggestion_file(entry.name))
+
+    def poll(self, timeout):
+        """Wait up to timeout seconds and return (changed paths, removed paths)."""
+        changed, removed = set(), set()
+        for event in self._inotify.read(timeout=int(timeout * 1000)):
+            directory = self._watches.get(event.wd)
+            if directory is None or not event.name:
+                continue
+            path = os.path.join(directory, event.name)
+            if event.mask & inotify_flags.ISDIR:
+                if event.mask & (inotify_flags.CREATE | inotify_flags.MOVED_TO) and not event.name.startswith('.'):
+                    if directory != self.root or event.name not in self.skip_dirs:
+                        self._watch_new_tree(path, changed)
+                continue
+            if not is_suggestion_file(path):
+                continue
+            if event.mask & (inotify_flags.DELETE | inotify_flags.MOVED_FROM):
+                removed.add(path)
+                changed.discard(path)
+            elif event.mask & (inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO):
+                changed.add(path)
+                removed.discard(path)
+        return changed, removed
+
+def create_watcher(root, skip_dirs=(), poll_interval=DEFAULT_POLL_INTERVAL):
+    """Create an inotify watcher when available, otherwise a polling one."""
+    if INotify is not None:
+        try:
+            return InotifyWatcher(root, skip_dirs)
+        except OSError as e:
+            print(f"inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher(root, skip_dirs, poll_interval)
+
+def watch(root, on_changes, skip_dirs=(), debounce=DEFAULT_DEBOUNCE_SECONDS,
+          poll_interval=DEFAULT_POLL_INTERVAL, stop_event=None):
+    """Watch root and call on_changes(changed, removed) with debounced batches.
+
+    Blocks until interrupted or until stop_event (a threading.Event) is set.
+    """
+    watcher = create_watcher(root, skip_dirs, poll_interval)
+    pending_changed, pending_removed = set(), set()
+    first_pending = last_event = None
+
+    while stop_event is None or not stop_event.is_set():
+        changed, removed = watcher.poll(debounce)
+        now = time.monotonic()
+        if changed or removed:
+            pending_changed = (pending_changed - removed) | changed
+            pending_removed = (pending_removed - changed) | removed
+            last_event = now
+            first_pending = first_pending or now
+
+        if first_pending is None:
+            continue
+        if now - last_event >= debounce or now - first_pending >= MAX_BATCH_DELAY_SECONDS:
+            # Files that were written and then deleted within the batch count as removed
+            batch_changed = {path for path in pending_changed if os.path.exists(path)}
+            batch_removed = pending_removed | (pending_changed - batch_changed)
+            pending_changed, pending_removed = set(), set()
+            first_pending = last_event = None
+            on_changes(batch_changed, batch_removed)
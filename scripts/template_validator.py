@@ -0,0 +1,132 @@
+"""
+Template Validator
+
+Checks generated suggestions against the required sections of their
+category's response-template.md, and splices replacement sections into a
+suggestion so that only the defective parts have to be regenerated.
+
+A section is defective if its heading is missing, its body is empty or still
+contains a {{PLACEHOLDER}}, or, for the rating section (the one whose
+template body is "{{RATING}} / 10"), if it has no valid "N / 10" score.
+"""
+
+import re
+
+# Sections are level-2 headings; deeper headings belong to their section's body
+HEADING_PATTERN = re.compile(r'^##[ \t]+(.+?)[ \t]*#*[ \t]*$', re.MULTILINE)
+RATING_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*/\s*10\b')
+PLACEHOLDER_PATTERN = re.compile(r'\{\{[^}]+\}\}')
+
+def normalize_heading(heading):
+    """Normalize a heading for comparison: drop markdown emphasis, case and spacing."""
+    heading = re.sub(r'[*_`:]', '', heading)
+    return re.sub(r'\s+', ' ', heading).strip().lower()
+
+def parse_template(template):
+    """Return (required section headings in order, rating heading or None) for a template."""
+    headings = []
+    rating_heading = None
+    for heading, body in split_sections(template):
+        if heading is None or PLACEHOLDER_PATTERN.fullmatch(heading):
+            continue
+        headings.append(heading)
+        if "{{RATING}}" in body:
+            rating_heading = heading
+    return headings, rating_heading
+
+def section_spans(text):
+    """Return [(heading, start, body start, end)] offsets of the level-2 sections in text."""
+    matches = list(HEADING_PATTERN.finditer(text))
+    return [(match.group(1).strip(), match.start(), match.end(),
+             matches[i + 1].start() if i + 1 < len(matches) else len(text))
+            for i, match in enumerate(matches)]
+
+def split_sections(text):
+    """Split markdown into [(heading, body)], with (None, preamble) first."""
+    spans = section_spans(text)
+    sections = [(None, text[:spans[0][1] if spans else len(text)].strip())]
+    sections.extend((heading, text[body_start:end].strip()) for heading, _, body_start, end in spans)
+    return sections
+
+def valid_rating(body):
+    """Return True if a rating section body holds a score between 0 and 10."""
+    match = RATING_PATTERN.search(body)
+    return bool(match) and 0 <= float(match.group(1)) <= 10
+
+def find_defects(text, template):
+    """Return {required heading: reason} for every missing or invalid section."""
+    required, rating_heading = parse_template(template)
+    present = {}
+    for heading, body in split_sections(text):
+        if heading is not None:
+            present.setdefault(normalize_heading(heading), body)
+
+    defects = {}
+    for heading in required:
+        body = present.get(normalize_heading(heading))
+        if body is None:
+            defects[heading] = "missing"
+        elif not body or PLACEHOLDER_PATTERN.search(body):
+            defects[heading] = "empty"
+        elif heading == rating_heading and not valid_rating(body):
+            defects[heading] = "no valid 'N / 10' rating"
+    return defects
+
+def splice_sections(text, replacements, template):
+    """Insert or replace sections in text.
+
+    replacements maps required headings to their new bodies. The body of an
+    existing section is replaced in place, under its original heading;
+    missing sections are inserted as level-2 headings after the last
+    section that precedes them in the template. Everything else in text is
+    kept exactly as written.
+    """
+    required, _ = parse_template(template)
+    order = {normalize_heading(heading): i for i, heading in enumerate(required)}
+    pending = {normalize_heading(heading): (heading, body) for heading, body in replacements.items()}
+    if not text.endswith("\n"):
+        text += "\n"
+
+    spans = section_spans(text)
+    edits = []
+    for heading, _, body_start, end in spans:
+        key = normalize_heading(heading)
+        if key in pending:
+            _, body = pending.pop(key)
+            edits.append((body_start, end, (0,), f"\n\n{body.strip()}\n" + ("\n" if end < len(text) else "")))
+
+    # Insert whatever is left, in template order
+    for key, (heading, body) in pending.items():
+        rank = order.get(key, len(order))
+        # After the last section that comes before it, or else ahead of the first section
+        position = spans[0][1] if spans else len(text)
+        for existing, _, _, end in spans:
+            if order.get(normalize_heading(existing), len(order)) < rank:
+                position = end
+        section = f"## {heading}\n\n{body.strip()}\n"
+        section = "\n" + section if position == len(text) else section + "\n"
+        edits.append((position, position, (1, rank), section))
+
+    pieces = []
+    cursor = 0
+    for start, end, _, replacement in sorted(edits):
+        pieces.append(text[cursor:start])
+        pieces.append(replacement)
+        cursor = end
+    pieces.append(text[cursor:])
+    return "".join(pieces)
+
+def parse_repair_response(text, wanted_headings):
+    """Pull the requested sections out of a repair response.
+
+    Returns {heading: body} for the wanted headings that the response contains.
+    """
+    wanted = {normalize_heading(heading): heading for heading in wanted_headings}
+    sections = {}
+    for heading, body in split_sections(text):
+        if heading is None:
+            continue
+        key = normalize_heading(heading)
+        if key in wanted and body:
+            sections[wanted[key]] = body
+    return sections
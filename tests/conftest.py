@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The scripts import their sibling modules directly
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scripts"))
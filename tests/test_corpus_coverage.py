@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from corpus_coverage import build_coverage_map, steering_hints
+
+THEMES = {
+    "drone": ["drone", "aerial", "photography", "footage", "survey"],
+    "podcast": ["podcast", "audio", "editing", "episodes", "interviews"],
+    "bakery": ["bakery", "bread", "sourdough", "market", "stall"],
+    "tutoring": ["tutoring", "students", "lessons", "exam", "maths"]
+}
+GENERIC = ["income", "clients", "weekly", "startup", "costs", "hours", "growth", "online"]
+
+def make_documents(counts, seed=0):
+    rng = random.Random(seed)
+    documents = []
+    for theme, count in counts.items():
+        for i in range(count):
+            terms = {word: rng.randint(1, 4) for word in rng.sample(THEMES[theme], 4)}
+            terms.update({word: rng.randint(1, 3) for word in rng.sample(GENERIC, 5)})
+            documents.append({"title": f"{theme.title()} idea {i}", "rating": 7.0, "terms": terms})
+    rng.shuffle(documents)
+    return documents
+
+def test_dominant_theme_keeps_its_terms_and_is_avoided(tmp_path):
+    # The drone theme makes up 55% of the corpus
+    documents = make_documents({"drone": 165, "podcast": 45, "bakery": 45, "tutoring": 45})
+    coverage = build_coverage_map("side_hustles", documents, profile_path=str(tmp_path / "missing.json"))
+
+    top = coverage["themes"][0]
+    assert "drone" in top["top_terms"]
+    assert top["share"] == pytest.approx(0.55, abs=0.02)
+    assert coverage["avoid"] == [top["id"]]
+
+    hints = steering_hints(coverage)
+    avoid_line = next(line for line in hints.splitlines() if line.startswith("- AVOID"))
+    assert any(word in avoid_line for word in THEMES["drone"])
+    for theme in ("podcast", "bakery", "tutoring"):
+        assert not any(word in avoid_line for word in THEMES[theme])
@@ -0,0 +1,44 @@
+import json
+import threading
+import http.client
+
+import pytest
+
+import job_server
+from job_server import JobQueue, make_handler
+
+PROFILE = {"user": {"name": "Test"}}
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    # Run manifests are written relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    httpd = job_server.ThreadingHTTPServer(("127.0.0.1", 0), make_handler(queue, "test-model", None))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address[1], queue
+    httpd.shutdown()
+    httpd.server_close()
+
+def post_job(port, body):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    connection.request("POST", "/jobs", body=body, headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    payload = json.loads(response.read())
+    connection.close()
+    return response.status, payload
+
+@pytest.mark.parametrize("temperature", ['"nan"', '"inf"', "-0.5", "2.5", "1e400"])
+def test_invalid_temperature_is_rejected(server, temperature):
+    port, queue = server
+    status, payload = post_job(port, f'{{"profile": {json.dumps(PROFILE)}, "temperature": {temperature}}}')
+    assert status == 400
+    assert "temperature" in payload["error"]
+    assert queue.list() == []
+
+def test_valid_temperature_is_queued(server):
+    port, queue = server
+    status, payload = post_job(port, json.dumps({"profile": PROFILE, "temperature": 0.9}))
+    assert status == 201
+    assert queue.get(payload["id"])["temperature"] == 0.9
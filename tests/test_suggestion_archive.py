@@ -0,0 +1,27 @@
+import os
+
+from suggestion_archive import archive_path, pack_run, unpack_run
+from suggestion_metadata import append_run_record, runs_dir
+
+def test_unpack_restores_the_packed_bytes(tmp_path):
+    suggestions_dir = str(tmp_path)
+    relative_path = os.path.join("side_hustles", "20260101-01-idea.md")
+    # Invalid UTF-8 and Windows newlines must survive the round trip unchanged
+    content = b"# Idea\r\n\r\n## Summary\r\nCaf\xe9 \xff\xfe pop-up\r\n"
+    file_path = tmp_path / relative_path
+    file_path.parent.mkdir()
+    file_path.write_bytes(content)
+    os.utime(file_path, ns=(1_700_000_000_123_456_789, 1_700_000_000_123_456_789))
+
+    run_id = "20260101-000000-000000"
+    append_run_record(suggestions_dir, run_id, {"event": "start", "model": "test-model"})
+    append_run_record(suggestions_dir, run_id, {"event": "suggestion", "file": relative_path})
+    append_run_record(suggestions_dir, run_id, {"event": "end"})
+
+    assert pack_run(suggestions_dir, run_id, os.path.join(runs_dir(suggestions_dir), f"{run_id}.jsonl")) == 1
+    assert not file_path.exists()
+
+    assert unpack_run(suggestions_dir, run_id) == 1
+    assert file_path.read_bytes() == content
+    assert os.stat(file_path).st_mtime_ns == 1_700_000_000_123_456_789
+    assert not os.path.exists(archive_path(suggestions_dir, run_id))
@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+import suggestion_watcher
+from suggestion_watcher import InotifyWatcher
+
+pytestmark = pytest.mark.skipif(suggestion_watcher.INotify is None, reason="needs inotify_simple")
+
+def write(path, text="# Idea\n"):
+    with open(path, 'w') as f:
+        f.write(text)
+
+def test_nested_directories_are_watched(tmp_path):
+    watcher = InotifyWatcher(str(tmp_path))
+    nested = tmp_path / "jobs" / "abc" / "side_hustles"
+    os.makedirs(nested)
+    first = nested / "01-first.md"
+    write(first)
+
+    changed, removed = watcher.poll(0.2)
+    assert str(first) in changed
+    assert not removed
+
+    second = nested / "02-second.md"
+    write(second)
+    changed, _ = watcher.poll(0.2)
+    assert changed == {str(second)}
+
+def test_moved_in_tree_reports_existing_files(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    staging = tmp_path / "staging" / "side_hustles"
+    os.makedirs(staging)
+    write(staging / "01-idea.md")
+    watcher = InotifyWatcher(str(root))
+
+    os.rename(tmp_path / "staging", root / "sweep")
+    changed, _ = watcher.poll(0.2)
+    assert changed == {str(root / "sweep" / "side_hustles" / "01-idea.md")}